@@ -0,0 +1,20 @@
+#!/bin/bash
+# 업종 평균 지표(sector_metrics) 갱신 스크립트 - 매시간 실행
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+cd "$PROJECT_ROOT"
+
+echo "[$(date)] 업종 평균 지표 갱신 시작"
+
+# .env 로드
+set -a
+source .env
+set +a
+
+/Library/Developer/CommandLineTools/usr/bin/python3 -m src.pipeline --sector-metrics
+
+echo "[$(date)] 업종 평균 지표 갱신 완료"
@@ -187,8 +187,16 @@ class DynamicsAgent(BaseAgent):
 
             # 최근 주가 데이터
             cutoff = datetime.now() - timedelta(days=lookback_days)
+            # 필요한 컬럼만 조회 (ORM 객체 생성 없이 Row 튜플, 속성 접근은 동일)
             price_data = (
-                session.query(PriceData)
+                session.query(
+                    PriceData.date,
+                    PriceData.open,
+                    PriceData.high,
+                    PriceData.low,
+                    PriceData.close,
+                    PriceData.volume,
+                )
                 .filter(
                     PriceData.stock_id == stock.id,
                     PriceData.date >= cutoff.date(),
@@ -81,6 +81,21 @@ class SignalAgent(BaseAgent):
 마크다운 헤더(##, ###)와 강조(**bold**)를 적극 활용하십시오.
 """
 
+    def __init__(self, config: Dict, db=None):
+        super().__init__(config, db)
+        self._sub_agents = None  # 첫 analyze() 호출 시 생성 후 재사용
+
+    def _get_sub_agents(self) -> Dict[str, BaseAgent]:
+        """하위 4개 에이전트 (호출마다 재생성하지 않음)"""
+        if self._sub_agents is None:
+            self._sub_agents = {
+                'news': NewsAgent(self.config, self.db),
+                'fundamentals': FundamentalsAgent(self.config, self.db),
+                'dynamics': DynamicsAgent(self.config, self.db),
+                'macro': MacroAgent(self.config, self.db),
+            }
+        return self._sub_agents
+
     def aggregate(
         self,
         ticker: str,
@@ -248,22 +263,20 @@ CIO로서의 명확한 판단과 핵심 논거에 집중하십시오.
         try:
             from concurrent.futures import ThreadPoolExecutor, as_completed
             
+            agents = self._get_sub_agents()
+            
             # 4개 에이전트 병렬 실행
             def run_news():
-                agent = NewsAgent(self.config, self.db)
-                return agent.analyze(ticker)
+                return agents['news'].analyze(ticker)
             
             def run_fundamentals():
-                agent = FundamentalsAgent(self.config, self.db)
-                return agent.analyze(ticker)
+                return agents['fundamentals'].analyze(ticker)
             
             def run_dynamics():
-                agent = DynamicsAgent(self.config, self.db)
-                return agent.analyze(ticker)
+                return agents['dynamics'].analyze(ticker)
             
             def run_macro():
-                agent = MacroAgent(self.config, self.db)
-                return agent.analyze(lookback_days=90)
+                return agents['macro'].analyze(lookback_days=90)
             
             with ThreadPoolExecutor(max_workers=4) as executor:
                 futures = {
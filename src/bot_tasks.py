@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Telegram 봇 백그라운드 작업
+
+/백테스팅, /포트폴리오 처럼 오래 걸리는 명령은 봇이 직접 실행하지 않고
+별도 프로세스로 분리 실행한 뒤, 완료되면 결과를 Telegram으로 전송한다.
+(봇 프로세스는 즉시 응답하고, 여러 요청이 병렬로 실행됨)
+
+Usage:
+  python3 -m src.bot_tasks backtest 005930 --name 삼성전자 --years 2
+  python3 -m src.bot_tasks portfolio --top 50
+  python3 -m src.bot_tasks portfolio --tickers 005930 000660
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import subprocess
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger("bot_tasks")
+
+LOG_DIR = "logs"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def enqueue(task: str, *args: str) -> int:
+    """작업을 분리된 백그라운드 프로세스로 실행하고 PID 반환"""
+    os.makedirs(os.path.join(PROJECT_ROOT, LOG_DIR), exist_ok=True)
+    log_path = os.path.join(
+        PROJECT_ROOT, LOG_DIR,
+        f"bot_{task}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    )
+
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "src.bot_tasks", task, *args],
+            cwd=PROJECT_ROOT,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,  # 봇 프로세스 종료와 무관하게 실행
+        )
+
+    logger.info(f"[작업] {task} 시작 (PID {proc.pid}, 로그 {log_path})")
+    return proc.pid
+
+
+def _send(message: str, chat_id: Optional[str]):
+    from src.notifications.telegram_notifier import get_notifier
+
+    notifier = get_notifier()
+    if chat_id:
+        notifier.send_to_user(chat_id, message)
+    else:
+        notifier.send(message)
+
+
+def run_backtest(ticker: str, name: str, years: int, chat_id: Optional[str] = None):
+    """전략 비교 백테스팅 후 결과 전송"""
+    from src.storage.database import init_db
+    from src.backtest import BacktestEngine
+    from src.run_backtest import compare_strategies
+    from src.utils.helpers import load_config
+
+    db = init_db(load_config())
+    engine = BacktestEngine(db)
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365 * years)
+
+    try:
+        results = compare_strategies(engine, ticker, start_date, end_date, db)
+    except Exception as e:
+        logger.error(f"[백테스팅] {ticker} 실패: {e}")
+        _send(f"❌ **백테스팅 실패**\n\n종목: {name} ({ticker})\n오류: {e}", chat_id)
+        return
+
+    lines = [
+        "✅ **백테스팅 완료**",
+        "",
+        f"**종목**: {name} ({ticker})",
+        f"**기간**: {years}년",
+        "",
+    ]
+    for r in sorted(results, key=lambda r: r.total_return, reverse=True):
+        lines.append(
+            f"• {r.strategy_name}: {r.total_return*100:+.1f}% "
+            f"(샤프 {r.sharpe_ratio:.2f}, MDD {r.max_drawdown*100:.1f}%)"
+        )
+    if results:
+        best = max(results, key=lambda r: r.sharpe_ratio)
+        lines += ["", f"🏆 최고 샤프비율: {best.strategy_name}"]
+    lines += ["", f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M')}"]
+
+    _send("\n".join(lines), chat_id)
+
+
+def run_portfolio(tickers: Optional[List[str]] = None, top: Optional[int] = None,
+                  chat_id: Optional[str] = None):
+    """샤프비율 최대화 포트폴리오 최적화 후 결과 전송"""
+    from src.storage.database import init_db
+    from src.portfolio import PortfolioOptimizer
+    from src.optimize_portfolio import get_top_stocks
+    from src.utils.helpers import load_config
+
+    db = init_db(load_config())
+
+    if top:
+        with db.get_session() as session:
+            tickers = get_top_stocks(session, top)
+
+    try:
+        optimizer = PortfolioOptimizer(db, risk_free_rate=0.035)
+        portfolio = optimizer.optimize(tickers=tickers, method="max_sharpe")
+    except Exception as e:
+        logger.error(f"[포트폴리오] 최적화 실패: {e}")
+        _send(f"❌ **포트폴리오 최적화 실패**\n\n오류: {e}", chat_id)
+        return
+
+    lines = [
+        "✅ **포트폴리오 최적화 완료**",
+        "",
+        f"**기대 수익률**: {portfolio['expected_return']*100:.2f}%",
+        f"**변동성**: {portfolio['volatility']*100:.2f}%",
+        f"**샤프비율**: {portfolio['sharpe_ratio']:.3f}",
+        "",
+        "**비중 (상위 10개)**:",
+    ]
+    weights = sorted(portfolio["weights"].items(), key=lambda x: x[1], reverse=True)
+    for ticker, weight in weights[:10]:
+        if weight > 0.001:
+            lines.append(f"• {ticker}: {weight*100:.1f}%")
+    lines += ["", f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M')}"]
+
+    _send("\n".join(lines), chat_id)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] %(levelname)s %(name)s: %(message)s",
+    )
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--chat-id", default=os.getenv("TELEGRAM_USER_CHAT_ID"))
+
+    parser = argparse.ArgumentParser(description="Telegram 봇 백그라운드 작업")
+    sub = parser.add_subparsers(dest="task", required=True)
+
+    bt = sub.add_parser("backtest", parents=[common], help="전략 비교 백테스팅")
+    bt.add_argument("ticker")
+    bt.add_argument("--name", default="")
+    bt.add_argument("--years", type=int, default=1)
+
+    pf = sub.add_parser("portfolio", parents=[common], help="포트폴리오 최적화")
+    group = pf.add_mutually_exclusive_group(required=True)
+    group.add_argument("--tickers", nargs="+")
+    group.add_argument("--top", type=int)
+
+    args = parser.parse_args()
+
+    if args.task == "backtest":
+        run_backtest(args.ticker, args.name or args.ticker, args.years, args.chat_id)
+    elif args.task == "portfolio":
+        run_portfolio(tickers=args.tickers, top=args.top, chat_id=args.chat_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -36,7 +36,11 @@ class BaseCollector(ABC):
         return run
 
     def _finish_run(self, run: PipelineRun, records: int = 0, error: str = None):
-        """파이프라인 실행 기록 완료"""
+        """파이프라인 실행 기록 완료
+
+        수집 건수는 수집기 내부에서 집계한 값을 실행당 한 번만 기록한다.
+        (행/배치 단위로 pipeline_runs 를 UPDATE 하지 말 것)
+        """
         run.finished_at = datetime.utcnow()
         run.records_collected = records
         if error:
@@ -19,10 +19,12 @@ from typing import Dict, List, Any, Optional
 
 from .base_collector import BaseCollector
 from src.storage.database import Database
-from src.storage.models import NewsArticle, Stock
+from src.storage.models import NewsArticle, NewsContent, Stock
 
 logger = logging.getLogger("marketsense")
 
+KEYWORD_CACHE_DAYS = 7  # LLM 검색 키워드 캐시 유효기간 (일)
+
 
 class NewsCollector(BaseCollector):
     """금융 뉴스 수집기 (Finnhub, NewsAPI, RSS)"""
@@ -217,8 +219,7 @@ class NewsCollector(BaseCollector):
                         stock_id=stock_id,
                         ticker=ticker,
                         title=article.get("headline", ""),
-                        summary=article.get("summary", ""),
-                        content=None,  # Finnhub은 본문 미제공
+                        summary=article.get("summary", ""),  # Finnhub은 본문 미제공
                         url=url,
                         source="finnhub",
                         source_id=str(article.get("id", "")),
@@ -255,8 +256,8 @@ class NewsCollector(BaseCollector):
         count = 0
 
         # 배치 처리 (NewsAPI는 쿼리당 최대 5종목 추천)
-        from src.utils.helpers import chunk_list
-        for batch in chunk_list(tickers, 5):
+        from src.utils.helpers import ichunks
+        for batch in ichunks(tickers, 5):
             query = " OR ".join(batch)
             try:
                 params = {
@@ -290,13 +291,14 @@ class NewsCollector(BaseCollector):
                         ticker=batch[0],  # 대표 티커
                         title=article.get("title", ""),
                         summary=article.get("description", ""),
-                        content=article.get("content", ""),
                         url=url,
                         source="newsapi",
                         author=article.get("author", ""),
                         published_at=pub_at,
                         related_tickers=batch,
                     )
+                    if article.get("content"):
+                        news.blob = NewsContent(content=article["content"])
                     session.add(news)
                     count += 1
 
@@ -365,11 +367,15 @@ class NewsCollector(BaseCollector):
         count = 0
         total_tickers = len(tickers)
         
+        # 종목 일괄 조회 + 검색 키워드 일괄 생성 (캐시 없는 종목만)
+        stocks = {s.ticker: s for s in session.query(Stock).filter(Stock.ticker.in_(tickers))}
+        self._prefetch_search_keywords(list(stocks.values()))
+        
         for idx, ticker in enumerate(tickers):
             if idx % 50 == 0 and idx > 0:
                 logger.info(f"[NaverSearch] 진행: {idx}/{total_tickers} ({count}건)")
             
-            stock = session.query(Stock).filter_by(ticker=ticker).first()
+            stock = stocks.get(ticker)
             if not stock:
                 continue
             
@@ -461,37 +467,83 @@ class NewsCollector(BaseCollector):
         logger.info(f"[NaverSearch] 총 {count}건 수집 완료")
         return count
     
-    def _expand_query(self, stock: Stock) -> List[str]:
-        """쿼리 확장: LLM 기반 또는 폴백"""
-        # 1. 캐시 확인 (raw_data에 저장)
+    @staticmethod
+    def _cached_keywords(stock: Stock) -> Optional[List[str]]:
+        """raw_data에 캐시된 검색 키워드 (KEYWORD_CACHE_DAYS 경과 시 None → 재생성)"""
         if hasattr(stock, 'raw_data') and stock.raw_data:
             cached_keywords = stock.raw_data.get('search_keywords')
             if cached_keywords and isinstance(cached_keywords, list):
-                logger.debug(f"[QueryExpander] {stock.name}: 캐시 사용")
+                cached_at = stock.raw_data.get('search_keywords_at')
+                if cached_at and datetime.fromisoformat(cached_at) < datetime.now() - timedelta(days=KEYWORD_CACHE_DAYS):
+                    return None
                 return cached_keywords
+        return None
+    
+    @staticmethod
+    def _cache_keywords(stock: Stock, keywords: List[str]):
+        """검색 키워드 캐시 저장 시도 (다음 실행에도 재사용)"""
+        try:
+            # JSON 컬럼은 내부 변경을 추적하지 않으므로 새 dict 를 대입해야 DB 에 저장됨
+            stock.raw_data = {
+                **(getattr(stock, 'raw_data', None) or {}),
+                'search_keywords': keywords,
+                'search_keywords_at': datetime.now().isoformat(timespec='seconds'),
+            }
+        except Exception as e:
+            logger.debug(f"[QueryExpander] {stock.name} 캐시 저장 실패 (무시): {e}")
+    
+    @staticmethod
+    def _stock_info(stock: Stock) -> Dict[str, Any]:
+        """QueryExpander 입력 형식"""
+        return {
+            'name': stock.name,
+            'ticker': stock.ticker,
+            'sector': stock.sector,
+            'market_cap': stock.market_cap,
+            'industry': stock.industry
+        }
+    
+    def _prefetch_search_keywords(self, stocks: List[Stock]):
+        """캐시 없는 종목의 검색 키워드를 EXPAND_BATCH_SIZE 개씩 묶어 LLM 으로 생성
+        
+        종목마다 LLM 을 호출하는 대신 한 번의 프롬프트로 여러 종목을 처리한다.
+        LLM 이 답한 종목만 캐시하고, 실패·누락 종목은 _expand_query 가 종목별 LLM 호출/폴백으로 처리한다.
+        """
+        missing = [stock for stock in stocks if not self._cached_keywords(stock)]
+        if not missing:
+            return
         
-        # 2. LLM으로 키워드 생성 시도
         try:
-            from src.utils.query_expander import QueryExpander
+            from src.utils.helpers import ichunks
+            from src.utils.query_expander import get_query_expander, EXPAND_BATCH_SIZE
             
-            expander = QueryExpander()
-            stock_info = {
-                'name': stock.name,
-                'ticker': stock.ticker,
-                'sector': stock.sector,
-                'market_cap': stock.market_cap,
-                'industry': stock.industry
-            }
+            expander = get_query_expander()
+            for batch in ichunks(missing, EXPAND_BATCH_SIZE):
+                results = expander.expand_queries_batch([self._stock_info(s) for s in batch])
+                for stock in batch:
+                    if results.get(stock.ticker):
+                        self._cache_keywords(stock, results[stock.ticker])
+                        
+        except Exception as e:
+            logger.warning(f"[QueryExpander] 일괄 키워드 생성 실패, 종목별 처리: {e}")
+    
+    def _expand_query(self, stock: Stock) -> List[str]:
+        """쿼리 확장: LLM 기반 또는 폴백"""
+        # 1. 캐시 확인 (raw_data에 저장)
+        cached_keywords = self._cached_keywords(stock)
+        if cached_keywords:
+            logger.debug(f"[QueryExpander] {stock.name}: 캐시 사용")
+            return cached_keywords
+        
+        # 2. LLM으로 키워드 생성 시도
+        try:
+            from src.utils.query_expander import get_query_expander
             
-            keywords = expander.expand_query(stock_info)
+            expander = get_query_expander()
+            keywords = expander.expand_query(self._stock_info(stock))
             
             # 캐시 저장 시도 (다음에 재사용)
-            try:
-                if not hasattr(stock, 'raw_data') or stock.raw_data is None:
-                    stock.raw_data = {}
-                stock.raw_data['search_keywords'] = keywords
-            except Exception as e:
-                logger.debug(f"[QueryExpander] {stock.name} 캐시 저장 실패 (무시): {e}")
+            self._cache_keywords(stock, keywords)
             
             return keywords
             
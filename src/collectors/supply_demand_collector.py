@@ -28,6 +28,19 @@ class SupplyDemandCollector(BaseCollector):
     def __init__(self, config: Dict, db: Database):
         super().__init__(config, db)
         self.lookback_days = config.get("supply_demand", {}).get("lookback_days", 30)
+        self._kis_api = None
+        self._kis_checked = False
+
+    def _get_kis_api(self):
+        """수집 중 공유하는 KIS 클라이언트 (토큰·HTTP 연결 재사용, API 키 없으면 None)"""
+        if not self._kis_checked:
+            self._kis_checked = True
+            from src.utils.kis_api import get_kis_api
+            try:
+                self._kis_api = get_kis_api()
+            except ValueError:
+                pass
+        return self._kis_api
 
     def collect(self, tickers: list = None, **kwargs):
         """수급 데이터 수집"""
@@ -81,17 +94,12 @@ class SupplyDemandCollector(BaseCollector):
         count = 0
         
         try:
-            from src.utils.kis_api import KISApi
-            
             stock = session.query(Stock).filter_by(ticker=ticker).first()
             if not stock:
                 return 0
             
-            # KIS API 초기화
-            try:
-                api = KISApi()
-            except ValueError:
-                # API 키가 없으면 skip
+            api = self._get_kis_api()
+            if api is None:
                 return 0
             
             # 최근 lookback_days 동안의 투자자별 매매
@@ -223,16 +231,12 @@ class SupplyDemandCollector(BaseCollector):
         count = 0
         
         try:
-            from src.utils.kis_api import KISApi
-            
             stock = session.query(Stock).filter_by(ticker=ticker).first()
             if not stock:
                 return 0
             
-            # KIS API 초기화
-            try:
-                api = KISApi()
-            except ValueError:
+            api = self._get_kis_api()
+            if api is None:
                 return 0
             
             # 최근 데이터 조회
@@ -293,16 +297,12 @@ class SupplyDemandCollector(BaseCollector):
         count = 0
         
         try:
-            from src.utils.kis_api import KISApi
-            
             stock = session.query(Stock).filter_by(ticker=ticker).first()
             if not stock:
                 return 0
             
-            # KIS API 초기화
-            try:
-                api = KISApi()
-            except ValueError:
+            api = self._get_kis_api()
+            if api is None:
                 return 0
             
             # 최근 lookback_days 동안의 공매도
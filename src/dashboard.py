@@ -14,6 +14,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from src.storage.database import Database
 from src.storage.models import (
@@ -217,7 +218,9 @@ def render_fundamentals(session):
             st.info("재무제표 데이터 없음")
 
     with tab2:
-        filings = session.query(SECFiling).filter_by(
+        filings = session.query(SECFiling).options(
+            selectinload(SECFiling.blob)
+        ).filter_by(
             stock_id=stock.id
         ).order_by(SECFiling.filing_date.desc()).all()
 
@@ -226,21 +229,23 @@ def render_fundamentals(session):
                 with st.expander(f"[{f.filing_type}] {f.filing_date} (Accession: {f.accession_number})"):
                     if f.file_url:
                         st.write(f"🔗 [SEC 원문]({f.file_url})")
-                    if f.raw_text:
-                        st.text_area("본문 (일부)", f.raw_text[:3000], height=200)
+                    if f.blob and f.blob.raw_text:
+                        st.text_area("본문 (일부)", f.blob.raw_text[:3000], height=200)
         else:
             st.info("SEC Filing 데이터 없음")
 
     with tab3:
-        calls = session.query(EarningsCall).filter_by(
+        calls = session.query(EarningsCall).options(
+            selectinload(EarningsCall.blob)
+        ).filter_by(
             stock_id=stock.id
         ).order_by(EarningsCall.call_date.desc()).all()
 
         if calls:
             for c in calls:
                 with st.expander(f"{c.call_date} - {c.title or 'Earnings Call'}"):
-                    if c.full_transcript:
-                        st.text_area("트랜스크립트", c.full_transcript[:5000], height=300)
+                    if c.blob and c.blob.full_transcript:
+                        st.text_area("트랜스크립트", c.blob.full_transcript[:5000], height=300)
         else:
             st.info("Earnings Call 데이터 없음")
 
@@ -351,14 +356,20 @@ def render_macro(session):
             st.info("매크로 지표 데이터 없음")
 
     with tab2:
-        reports = session.query(MacroReport).order_by(MacroReport.published_at.desc()).limit(50).all()
+        reports = (
+            session.query(MacroReport)
+            .options(selectinload(MacroReport.blob))
+            .order_by(MacroReport.published_at.desc())
+            .limit(50)
+            .all()
+        )
         if reports:
             for r in reports:
                 with st.expander(f"[{r.source_name}] {r.title} ({r.published_at})"):
                     if r.summary:
                         st.write(f"**요약:** {r.summary[:1000]}")
-                    if r.raw_text:
-                        st.text_area("본문", r.raw_text[:3000], height=200, key=f"macro_{r.id}")
+                    if r.blob and r.blob.raw_text:
+                        st.text_area("본문", r.blob.raw_text[:3000], height=200, key=f"macro_{r.id}")
                     if r.source_url:
                         st.write(f"🔗 [원문]({r.source_url})")
         else:
@@ -1,18 +1,43 @@
 """Telegram 알림 전송
 
 OpenClaw message 기능을 사용하여 Telegram으로 알림 전송
+TELEGRAM_BOT_TOKEN 이 설정되어 있으면 Bot API로 직접 전송 (keep-alive 세션 재사용)
 """
+import html
 import logging
+import re
 import subprocess
 import os
 from typing import Optional
 from datetime import datetime
 
+import requests
+
 logger = logging.getLogger("marketsense")
 
+# 메시지는 OpenClaw 식 마크다운(**굵게**, *기울임*, _기울임_, `코드`)으로 작성되고 LLM 응답도
+# 그대로 섞여 들어온다. Bot API 에는 HTML 로 변환해 보낸다 (나머지는 이스케이프되어 문자 그대로).
+# 태그가 엇갈리지 않도록 이미 변환된 태그('<')나 줄바꿈은 넘어가지 않는다.
+_MARKDOWN_TO_HTML = (
+    (re.compile(r'`([^`<\n]+)`'), r'<code>\1</code>'),
+    (re.compile(r'\*\*([^<\n]+?)\*\*'), r'<b>\1</b>'),
+    (re.compile(r'(?<![\w*])\*(?![\s*])([^<\n]+?)(?<!\s)\*(?![\w*])'), r'<i>\1</i>'),
+    (re.compile(r'(?<!\w)_(?![\s_])([^<\n]+?)(?<!\s)_(?!\w)'), r'<i>\1</i>'),
+)
+
+
+def to_telegram_html(message: str) -> str:
+    """마크다운 메시지 → Telegram HTML (parse_mode=HTML)"""
+    text = html.escape(message, quote=False)
+    for pattern, repl in _MARKDOWN_TO_HTML:
+        text = pattern.sub(repl, text)
+    return text
+
 
 class TelegramNotifier:
     """Telegram 알림 전송"""
+    
+    API_URL = "https://api.telegram.org/bot{token}/sendMessage"
 
     def __init__(self, channel: str = "telegram", target: Optional[str] = None):
         """
@@ -31,11 +56,50 @@ class TelegramNotifier:
         
         self.target = target
         
+        # Bot API 직접 전송용 (없으면 OpenClaw CLI만 사용)
+        self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
+        self._session = None
+        
         if self.target:
             logger.info(f"[Telegram] 알림 채널: {self.target}")
         else:
             logger.info(f"[Telegram] 현재 대화로 전송")
 
+    def _send_via_api(self, chat_id: str, message: str, silent: bool = False) -> Optional[bool]:
+        """Bot API로 직접 전송 (세션 재사용으로 메시지마다 TCP/TLS 연결을 새로 맺지 않음)
+        
+        Returns:
+            True/False: 최종 결과 (CLI 재전송 안 함)
+            None: 전달되지 않은 것이 확실함 → CLI로 재시도
+        """
+        if self._session is None:
+            self._session = requests.Session()
+        
+        try:
+            resp = self._session.post(
+                self.API_URL.format(token=self.bot_token),
+                json={
+                    "chat_id": chat_id,
+                    "text": to_telegram_html(message),
+                    "parse_mode": "HTML",
+                    "disable_notification": silent,
+                },
+                timeout=15
+            )
+        except requests.ReadTimeout as e:
+            # 요청은 보냈으므로 이미 전달됐을 수 있다 - 중복 전송을 막기 위해 재시도하지 않음
+            logger.warning(f"[Telegram] Bot API 응답 시간 초과 (전달 여부 불명, 재전송 안 함): {e}")
+            return False
+        except requests.RequestException as e:
+            logger.warning(f"[Telegram] Bot API 전송 오류: {e} - CLI로 재시도")
+            return None
+        
+        if resp.status_code == 200:
+            logger.info(f"[Telegram] Bot API 전송 성공 ({chat_id})")
+            return True
+        logger.warning(f"[Telegram] Bot API 전송 실패 ({resp.status_code}: {resp.text[:200]}) - CLI로 재시도")
+        return None
+
     def send(self, message: str, silent: bool = False) -> bool:
         """메시지 전송
         
@@ -46,6 +110,11 @@ class TelegramNotifier:
         Returns:
             성공 여부
         """
+        if self.bot_token and self.target:
+            sent = self._send_via_api(self.target, message, silent)
+            if sent is not None:
+                return sent
+        
         try:
             # OpenClaw CLI로 메시지 전송
             cmd = ["openclaw", "message", "send"]
@@ -95,6 +164,11 @@ class TelegramNotifier:
         Returns:
             성공 여부
         """
+        if self.bot_token:
+            sent = self._send_via_api(chat_id, message, silent)
+            if sent is not None:
+                return sent
+        
         try:
             # OpenClaw CLI로 메시지 전송
             cmd = ["openclaw", "message", "send", "--target", chat_id]
@@ -125,6 +199,21 @@ class TelegramNotifier:
             logger.error(f"[Telegram] 사용자({chat_id}) 전송 오류: {e}")
             return False
 
+    def send_many_to_user(self, chat_id: str, messages: list, silent: bool = False) -> int:
+        """여러 메시지를 순서대로 전송
+        
+        Telegram은 도착 순서대로 표시하므로 동시 전송하지 않는다.
+        
+        Args:
+            chat_id: 텔레그램 chat ID
+            messages: 전송할 메시지 리스트
+            silent: 무음 알림 여부
+            
+        Returns:
+            전송 성공 건수
+        """
+        return sum(self.send_to_user(chat_id, msg, silent) for msg in messages)
+
     def send_signal_alert(self, ticker: str, stock_name: str, signal: str, 
                          confidence: float, reasons: dict) -> bool:
         """투자 신호 알림
@@ -10,7 +10,7 @@ Usage:
   python -m src.pipeline --collector fundamentals
   python -m src.pipeline --collector dynamics
   python -m src.pipeline --collector macro
-  python -m src.pipeline --init-db          # DB 초기화만
+  python -m src.pipeline --init-db          # DB 초기화 + 스키마 업그레이드 (파티션 등)
   python -m src.pipeline --init-universe    # 종목 유니버스 초기화
   python -m src.pipeline --tickers AAPL MSFT GOOGL  # 특정 종목만
 """
@@ -24,6 +24,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.utils.helpers import load_config, setup_logger, get_sp500_tickers, get_sp100_tickers
+from src.utils.peer_analysis import clear_peer_cache, refresh_sector_metrics
 from src.storage.database import init_db
 from src.storage.models import Stock
 from src.collectors.news_collector import NewsCollector
@@ -97,6 +98,17 @@ def run_pipeline(config, db, collector_name: str = None, tickers: list = None):
         except Exception as e:
             print(f"❌ [{name.upper()}] 실패: {e}")
 
+    # 새 재무제표·주가가 반영되도록 업종 평균 재계산 + 동종업계 비교 캐시 초기화
+    update_sector_metrics(db)
+
+
+def update_sector_metrics(db):
+    """업종 평균 지표 테이블 갱신 (scripts/update_sector_metrics.sh 로 매시간 실행)"""
+    with db.get_session() as session:
+        count = refresh_sector_metrics(session)
+    clear_peer_cache()
+    print(f"✅ 업종 평균 지표 갱신: {count}개 업종")
+
 
 def main():
     parser = argparse.ArgumentParser(description="MarketSenseAI Data Pipeline")
@@ -104,9 +116,10 @@ def main():
     parser.add_argument("--collector", choices=["news", "fundamentals", "dynamics", "macro"],
                         help="특정 수집기만 실행")
     parser.add_argument("--tickers", nargs="+", help="특정 종목만 수집")
-    parser.add_argument("--init-db", action="store_true", help="DB 초기화")
+    parser.add_argument("--init-db", action="store_true", help="DB 초기화 + 기존 스키마 업그레이드")
     parser.add_argument("--init-universe", action="store_true", help="종목 유니버스 초기화")
     parser.add_argument("--index", default="SP500", choices=["SP100", "SP500"])
+    parser.add_argument("--sector-metrics", action="store_true", help="업종 평균 지표만 갱신")
     args = parser.parse_args()
 
     config = load_config(args.config)
@@ -119,6 +132,8 @@ def main():
     db = init_db(config)
 
     if args.init_db:
+        # 기존 DB 스키마 맞춤 (파티션 생성 등) - 배포 후·연 1회 실행
+        db.upgrade_schema()
         print("✅ 데이터베이스 초기화 완료")
         return
 
@@ -126,6 +141,10 @@ def main():
         init_universe(db, args.index)
         return
 
+    if args.sector_metrics:
+        update_sector_metrics(db)
+        return
+
     run_pipeline(config, db, args.collector, args.tickers)
     print("\n🏁 파이프라인 완료!")
 
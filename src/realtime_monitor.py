@@ -12,7 +12,8 @@ from typing import Dict, Optional, List, Tuple
 import json
 
 from src.notifications.telegram_notifier import get_notifier
-from src.utils.kis_api import KISApi
+from src.utils.kis_api import get_kis_api
+from src.utils.helpers import write_pid_file
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +22,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("realtime")
 
+# 모니터 프로세스 PID 파일 (텔레그램 봇 /상태 에서 확인)
+PID_FILE = "data/realtime_monitor.pid"
+
+# 다종목 동시 조회 스레드 수
+PRICE_WORKERS = 8
+
 
 class RealtimeMonitor:
     """준실시간 주가 모니터링"""
@@ -40,7 +47,7 @@ class RealtimeMonitor:
         self.volume_threshold = volume_threshold
         self.notifier = get_notifier()
         self.last_prices = {}  # {ticker: (price, volume, timestamp)}
-        self.kis_api = KISApi()  # KIS API 클라이언트
+        self.kis_api = get_kis_api()  # KIS API 클라이언트 (프로세스 공유)
         logger.info("[모니터] KIS API 초기화 완료")
     
     def get_realtime_price(self, ticker: str) -> Optional[Dict]:
@@ -71,6 +78,21 @@ class RealtimeMonitor:
             logger.debug(f"[{ticker}] 실시간 가격 조회 오류: {e}")
             return None
     
+    def get_realtime_prices(self, tickers: List[str]) -> List[Optional[Dict]]:
+        """여러 종목 실시간 시세 동시 조회
+        
+        Args:
+            tickers: 종목 코드 리스트
+            
+        Returns:
+            tickers 순서대로 get_realtime_price 결과 리스트
+        """
+        # KIS 요청 제한·토큰 공유는 KISApi.fetch_many 가 처리
+        results = self.kis_api.fetch_many(
+            self.get_realtime_price, tickers, max_workers=PRICE_WORKERS
+        )
+        return [results[ticker] for ticker in tickers]
+    
     def check_price_change(self, ticker: str, name: str, 
                           current: Dict, last: Optional[Tuple]) -> bool:
         """가격 변동 체크 및 알림
@@ -281,6 +303,7 @@ def main():
         sys.exit(1)
     
     # 모니터 시작
+    write_pid_file(PID_FILE)
     monitor = RealtimeMonitor(
         interval=args.interval,
         price_threshold=args.threshold
@@ -1,6 +1,7 @@
 from .database import Database, init_db
 from .models import (
-    Base, Stock, NewsArticle, FinancialStatement,
-    SECFiling, EarningsCall, PriceData, TechnicalIndicator,
-    MacroReport, MacroIndicator, PipelineRun
+    Base, Stock, NewsArticle, NewsContent, FinancialStatement,
+    SECFiling, SECFilingBlob, EarningsCall, EarningsCallBlob,
+    PriceData, TechnicalIndicator,
+    MacroReport, MacroReportBlob, MacroIndicator, PipelineRun
 )
@@ -2,9 +2,10 @@
 import os
 import logging
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from .models import Base
+from .migrations import upgrade_schema
 
 logger = logging.getLogger("marketsense")
 
@@ -12,24 +13,29 @@ logger = logging.getLogger("marketsense")
 class Database:
     """SQLAlchemy 데이터베이스 관리"""
 
-    def __init__(self, db_url: str = None, echo: bool = False):
+    def __init__(self, db_url: str = None, echo: bool = False, **engine_kwargs):
+        """engine_kwargs 는 create_engine 에 그대로 전달 (poolclass, connect_args 등)"""
         self.db_url = db_url or os.getenv(
             "DATABASE_URL", "sqlite:///data/marketsense.db"
         )
 
-        # SQLite인 경우 디렉토리 생성
-        if self.db_url.startswith("sqlite"):
-            db_path = self.db_url.replace("sqlite:///", "")
-            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # SQLite 파일 DB인 경우 디렉토리 생성 (인메모리 제외)
+        url = make_url(self.db_url)
+        if url.get_backend_name() == "sqlite" and url.database and ":memory:" not in url.database:
+            os.makedirs(os.path.dirname(url.database) or ".", exist_ok=True)
 
-        self.engine = create_engine(self.db_url, echo=echo)
+        self.engine = create_engine(self.db_url, echo=echo, **engine_kwargs)
         self.SessionLocal = sessionmaker(bind=self.engine)
 
     def create_tables(self):
-        """모든 테이블 생성"""
+        """모든 테이블 생성 (없는 테이블만)"""
         Base.metadata.create_all(self.engine)
         logger.info("데이터베이스 테이블 생성 완료")
 
+    def upgrade_schema(self):
+        """기존 DB 스키마 업그레이드 - 파티션·기본값·인덱스 등 (--init-db 로 명시적 실행)"""
+        upgrade_schema(self.engine)
+
     def drop_tables(self):
         """모든 테이블 삭제 (주의!)"""
         Base.metadata.drop_all(self.engine)
@@ -0,0 +1,171 @@
+"""기존 DB 스키마 업그레이드 (명시적 실행 전용)
+
+create_all 은 새 테이블만 만들고 기존 테이블은 바꾸지 않는다. 기존 DB를 현재 모델에
+맞추는 작업은 여기 모아 두고 `python -m src.pipeline --init-db` 에서만 실행한다
+(init_db 는 매 프로세스마다 불리므로 반복 DDL·리플렉션을 하지 않는다).
+"""
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .models import Base
+from .partitioning import create_partitions
+
+logger = logging.getLogger("marketsense")
+
+# 본문을 사이드 테이블로 옮기기 전 컬럼: (원본 테이블, 사이드 테이블, 사이드 FK, 본문 컬럼들)
+LEGACY_BODY_COLUMNS = (
+    ("news_articles", "news_contents", "article_id", ("content",)),
+    ("sec_filings", "sec_filing_blobs", "filing_id",
+     ("raw_text", "risk_factors", "md_and_a", "notes")),
+    ("earnings_calls", "earnings_call_blobs", "call_id", ("full_transcript",)),
+    ("macro_reports", "macro_report_blobs", "report_id", ("raw_text",)),
+)
+
+
+def sync_server_defaults(engine):
+    """기존 PostgreSQL 테이블에 누락된 DB 기본값(server_default) 적용
+
+    타임스탬프 컬럼이 Python 기본값에서 DB 기본값으로 바뀐 경우 여기서 보정한다.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"]: c for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.server_default is None or column.name not in existing:
+                    continue
+                if existing[column.name].get("default") is not None:
+                    continue
+                default_sql = column.server_default.arg.compile(dialect=engine.dialect)
+                conn.exec_driver_sql(
+                    f'ALTER TABLE {table.name} ALTER COLUMN {column.name} SET DEFAULT {default_sql}'
+                )
+                logger.info(f"{table.name}.{column.name} 기본값 설정: {default_sql}")
+
+
+def convert_json_columns(engine):
+    """기존 PostgreSQL json 컬럼을 jsonb 로 변환 (JSONType 컬럼만)
+
+    JSONB GIN 인덱스(jsonb_path_ops)는 json 컬럼에 만들 수 없으므로 인덱스 생성 전에 실행한다.
+    ALTER ... TYPE 은 테이블을 다시 쓰며 쓰기를 막으므로 컬럼마다 따로 커밋한다.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    for table in Base.metadata.sorted_tables:
+        targets = [
+            column.name for column in table.columns
+            if isinstance(column.type.dialect_impl(engine.dialect), JSONB)
+        ]
+        if not targets:
+            continue
+
+        with engine.begin() as conn:
+            inspector = inspect(conn)
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+
+        for name in targets:
+            if name not in existing or isinstance(existing[name], JSONB):
+                continue
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    f'ALTER TABLE {table.name} ALTER COLUMN {name} TYPE jsonb USING {name}::jsonb'
+                )
+            logger.info(f"{table.name}.{name} 타입 변환: json → jsonb")
+
+
+def backfill_side_tables(engine):
+    """원본 테이블에 남은 본문을 사이드 테이블로 복사 (이미 있는 행은 건너뜀)
+
+    모델에서 빠진 옛 본문 컬럼은 삭제하지 않는다 (복사 확인 후 수동 정리).
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for parent, side, fk, body_columns in LEGACY_BODY_COLUMNS:
+            if not (inspector.has_table(parent) and inspector.has_table(side)):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(parent)}
+            columns = [name for name in body_columns if name in existing]
+            if not columns:
+                continue
+
+            column_list = ", ".join(columns)
+            has_body = " OR ".join(f"p.{name} IS NOT NULL" for name in columns)
+            result = conn.exec_driver_sql(
+                f"INSERT INTO {side} ({fk}, {column_list}) "
+                f"SELECT p.id, {', '.join('p.' + name for name in columns)} FROM {parent} p "
+                f"WHERE ({has_body}) "
+                f"AND NOT EXISTS (SELECT 1 FROM {side} s WHERE s.{fk} = p.id)"
+            )
+            logger.info(f"{parent} → {side} 본문 {result.rowcount}건 복사")
+
+
+def sync_indexes(engine):
+    """기존 테이블에 새로 정의된 인덱스 생성 (이름 기준으로 없는 것만)
+
+    PostgreSQL 은 CREATE INDEX CONCURRENTLY 로 만들어 큰 테이블에서도 쓰기를 막지 않는다
+    (트랜잭션 밖에서 실행해야 하므로 AUTOCOMMIT 연결 사용). 실패한 인덱스는 기록만 하고 계속한다.
+    """
+    is_pg = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                ddl_if = index._ddl_if  # ddl_if(dialect=...) 로 제한된 인덱스
+                if ddl_if is not None and ddl_if.dialect not in (None, engine.dialect.name):
+                    continue
+
+                if is_pg:
+                    index.dialect_options["postgresql"]["concurrently"] = True
+                try:
+                    index.create(conn)
+                    logger.info(f"{table.name} 인덱스 생성: {index.name}")
+                except Exception as e:
+                    # CONCURRENTLY 실패 시 INVALID 인덱스가 남을 수 있음 - 삭제 후 재실행
+                    logger.error(f"{table.name} 인덱스 생성 실패: {index.name} - {e}")
+                finally:
+                    if is_pg:
+                        index.dialect_options["postgresql"]["concurrently"] = False
+
+
+def rebuild_sector_metrics(engine):
+    """이전 형태(업종 평균 컬럼)의 sector_metrics 테이블을 현재 형태로 다시 생성
+
+    파생 데이터라 버려도 되며, 다음 `--sector-metrics` 실행 때 다시 채워진다.
+    """
+    table = Base.metadata.tables["sector_metrics"]
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return
+    existing = {c["name"] for c in inspector.get_columns(table.name)}
+    if "peers" in existing:
+        return
+    with engine.begin() as conn:
+        table.drop(conn)
+        table.create(conn)
+    logger.info("sector_metrics 테이블 재생성 (종목별 지표 형태)")
+
+
+def upgrade_schema(engine):
+    """기존 DB를 현재 모델에 맞춤 (멱등 - 여러 번 실행해도 안전)"""
+    create_partitions(engine)
+    sync_server_defaults(engine)
+    convert_json_columns(engine)
+    backfill_side_tables(engine)
+    rebuild_sector_metrics(engine)
+    sync_indexes(engine)  # jsonb 변환 후 (GIN jsonb_path_ops 인덱스)
+    logger.info("스키마 업그레이드 완료")
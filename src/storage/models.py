@@ -5,16 +5,57 @@
 2. Fundamentals Agent: FinancialStatement, SECFiling, EarningsCall
 3. Dynamics Agent: PriceData, TechnicalIndicator
 4. Macroeconomic Agent: MacroReport, MacroIndicator
+
+대용량 본문(뉴스 기사 본문, SEC 공시 원문, 컨퍼런스 콜 트랜스크립트, 매크로 보고서 원문)은
+*Blob 사이드 테이블로 분리되어, 메타데이터 조회 시 함께 로드되지 않는다.
 """
 from datetime import datetime
+
 from sqlalchemy import (
     Column, Integer, String, Float, Text, DateTime, Date,
-    Boolean, ForeignKey, Index, UniqueConstraint, JSON
+    Boolean, ForeignKey, Index, UniqueConstraint, JSON, DDL, event
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from sqlalchemy.orm import declarative_base, relationship
 
+from . import partitioning  # noqa: F401  (PostgreSQL 파티션 PK DDL 컴파일러 등록)
+
 Base = declarative_base()
 
+# gin_trgm_ops 인덱스용 확장 (테이블 생성 전)
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+class utcnow(FunctionElement):
+    """DB 서버의 현재 UTC 시각 (server_default 용)
+
+    ORM/Core INSERT 는 Python 기본값(datetime.utcnow)이 채운다. server_default 는
+    수동 SQL 로 넣는 행을 위한 것이며, 기본값이 없는 기존 SQLite 테이블에서도
+    Python 기본값 덕분에 NULL 이 들어가지 않는다.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP 는 트랜잭션 시작 시각 - 긴 수집 트랜잭션에서도 행마다 실제 시각
+    return "TIMEZONE('utc', clock_timestamp())"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"  # SQLite: 항상 UTC
+
+
+# PostgreSQL에서는 JSONB (파싱된 바이너리 저장, GIN 인덱스로 @> 검색 가능)
+# 기존 DB의 json 컬럼은 --init-db (migrations.convert_json_columns) 로 변환
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 # ═══════════════════════════════════════════
 # Core: Stock Universe
@@ -22,6 +63,12 @@ Base = declarative_base()
 class Stock(Base):
     """종목 마스터 테이블"""
     __tablename__ = "stocks"
+    __table_args__ = (
+        # 종목명 부분 검색 (LIKE/ILIKE '%삼성%') 용 트라이그램 인덱스
+        Index("ix_stocks_name_trgm", "name",
+              postgresql_using="gin",
+              postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True)
     ticker = Column(String(10), unique=True, nullable=False, index=True)
@@ -32,9 +79,9 @@ class Stock(Base):
     index_membership = Column(String(50))  # SP100, SP500
     cik = Column(String(20))  # SEC CIK number
     is_active = Column(Boolean, default=True)
-    raw_data = Column(JSON)  # 확장 데이터 (LLM 키워드 캐시 등)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    raw_data = Column(JSONType)  # 확장 데이터 (LLM 키워드 캐시 등)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow(), onupdate=datetime.utcnow)
 
     # Relationships
     news = relationship("NewsArticle", back_populates="stock")
@@ -45,6 +92,14 @@ class Stock(Base):
     indicators = relationship("TechnicalIndicator", back_populates="stock")
 
 
+# 업종별 시총 상위 조회 (get_peer_stocks) 용 - 시총 없는 종목은 제외한 부분 인덱스
+Index(
+    "ix_stocks_sector_mcap", Stock.sector, Stock.market_cap.desc(),
+    postgresql_where=Stock.market_cap.isnot(None),
+    sqlite_where=Stock.market_cap.isnot(None),
+)
+
+
 # ═══════════════════════════════════════════
 # 1. News Agent Data
 # ═══════════════════════════════════════════
@@ -54,6 +109,13 @@ class NewsArticle(Base):
     __table_args__ = (
         UniqueConstraint("url", name="uq_news_url"),
         Index("ix_news_stock_date", "stock_id", "published_at"),
+        # PostgreSQL: 수집 순서대로 쌓이는 시계열 → BRIN (수 KB 크기의 범위 인덱스)
+        Index("ix_news_published_brin", "published_at",
+              postgresql_using="brin").ddl_if(dialect="postgresql"),
+        # related_tickers @> '["005930"]' 검색용
+        Index("ix_news_related_tickers_gin", "related_tickers",
+              postgresql_using="gin",
+              postgresql_ops={"related_tickers": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -61,8 +123,7 @@ class NewsArticle(Base):
     ticker = Column(String(10), index=True)  # 여러 종목 관련 뉴스용
 
     title = Column(String(500), nullable=False)
-    summary = Column(Text)
-    content = Column(Text)  # 전체 기사 본문
+    summary = Column(Text)  # 본문은 NewsContent 사이드 테이블에 저장
     url = Column(String(1000), nullable=False)
     source = Column(String(100))  # finnhub, newsapi, rss
     author = Column(String(200))
@@ -71,11 +132,21 @@ class NewsArticle(Base):
 
     # 메타데이터
     category = Column(String(100))
-    related_tickers = Column(JSON)  # ["AAPL", "MSFT", ...]
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    related_tickers = Column(JSONType)  # ["AAPL", "MSFT", ...]
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     source_id = Column(String(200))  # 소스별 고유 ID
 
     stock = relationship("Stock", back_populates="news")
+    blob = relationship("NewsContent", uselist=False, lazy="raise",
+                        cascade="all, delete-orphan")
+
+
+class NewsContent(Base):
+    """뉴스 기사 전체 본문 (news_articles 1:1 사이드 테이블)"""
+    __tablename__ = "news_contents"
+
+    article_id = Column(Integer, ForeignKey("news_articles.id"), primary_key=True)
+    content = Column(Text)  # 전체 기사 본문
 
 
 # ═══════════════════════════════════════════
@@ -99,7 +170,7 @@ class FinancialStatement(Base):
     fiscal_quarter = Column(String(10))  # Q1, Q2, Q3, Q4
 
     # Raw data as JSON (모든 항목 보존)
-    raw_data = Column(JSON, nullable=False)
+    raw_data = Column(JSONType, nullable=False)
 
     # 주요 지표 (빠른 조회용)
     revenue = Column(Float)
@@ -112,7 +183,7 @@ class FinancialStatement(Base):
     free_cash_flow = Column(Float)
     eps = Column(Float)
 
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     source = Column(String(50), default="yfinance")
 
     stock = relationship("Stock", back_populates="financials")
@@ -136,20 +207,30 @@ class SECFiling(Base):
     fiscal_year = Column(Integer)
     fiscal_quarter = Column(String(10))
 
-    # 문서 내용
-    raw_text = Column(Text)  # 전체 텍스트
-    risk_factors = Column(Text)  # Item 1A
-    md_and_a = Column(Text)  # Item 7 (MD&A)
-    notes = Column(Text)  # 주석/공시
+    # 문서 내용 (본문은 SECFilingBlob 사이드 테이블에 저장)
     file_url = Column(String(500))
     file_size_bytes = Column(Integer)
 
     # 처리 상태
     is_parsed = Column(Boolean, default=False)
     parsed_at = Column(DateTime)
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
     stock = relationship("Stock", back_populates="filings")
+    # 대용량 본문은 명시적으로 로드할 때만 조회 (selectinload 등)
+    blob = relationship("SECFilingBlob", uselist=False, lazy="raise",
+                        cascade="all, delete-orphan")
+
+
+class SECFilingBlob(Base):
+    """SEC 공시 본문 (sec_filings 1:1 사이드 테이블)"""
+    __tablename__ = "sec_filing_blobs"
+
+    filing_id = Column(Integer, ForeignKey("sec_filings.id"), primary_key=True)
+    raw_text = Column(Text)  # 전체 텍스트
+    risk_factors = Column(Text)  # Item 1A
+    md_and_a = Column(Text)  # Item 7 (MD&A)
+    notes = Column(Text)  # 주석/공시
 
 
 class EarningsCall(Base):
@@ -171,17 +252,26 @@ class EarningsCall(Base):
     # 트랜스크립트 내용
     prepared_remarks = Column(Text)  # 경영진 발표 부분
     qa_session = Column(Text)  # Q&A 세션
-    full_transcript = Column(Text)  # 전체 트랜스크립트
 
     # 메타데이터
-    participants = Column(JSON)  # 참석자 목록
+    participants = Column(JSONType)  # 참석자 목록
     source = Column(String(50))  # rapidapi, seekingalpha
     source_url = Column(String(500))
 
     is_parsed = Column(Boolean, default=False)
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
     stock = relationship("Stock", back_populates="earnings_calls")
+    blob = relationship("EarningsCallBlob", uselist=False, lazy="raise",
+                        cascade="all, delete-orphan")
+
+
+class EarningsCallBlob(Base):
+    """실적 발표 전체 트랜스크립트 (earnings_calls 1:1 사이드 테이블)"""
+    __tablename__ = "earnings_call_blobs"
+
+    call_id = Column(Integer, ForeignKey("earnings_calls.id"), primary_key=True)
+    full_transcript = Column(Text)  # 전체 트랜스크립트
 
 
 # ═══════════════════════════════════════════
@@ -193,6 +283,10 @@ class PriceData(Base):
     __table_args__ = (
         UniqueConstraint("stock_id", "date", name="uq_price_date"),
         Index("ix_price_stock_date", "stock_id", "date"),
+        Index("ix_price_date_brin", "date",
+              postgresql_using="brin").ddl_if(dialect="postgresql"),
+        # PostgreSQL: date 기준 월별 RANGE 파티션 (partitioning.py)
+        {"postgresql_partition_by": "RANGE (date)", "info": {"partition_key": "date"}},
     )
 
     id = Column(Integer, primary_key=True)
@@ -210,7 +304,7 @@ class PriceData(Base):
     dividend = Column(Float, default=0)
     stock_split = Column(Float, default=0)
 
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
     stock = relationship("Stock", back_populates="prices")
 
@@ -246,7 +340,7 @@ class TechnicalIndicator(Base):
     sharpe_ratio_20d = Column(Float)
     max_drawdown_20d = Column(Float)
 
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
     stock = relationship("Stock", back_populates="indicators")
 
@@ -260,6 +354,9 @@ class MacroReport(Base):
     __table_args__ = (
         UniqueConstraint("source_url", name="uq_macro_url"),
         Index("ix_macro_source_date", "source_name", "published_at"),
+        Index("ix_macro_tags_gin", "tags",
+              postgresql_using="gin",
+              postgresql_ops={"tags": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -270,8 +367,7 @@ class MacroReport(Base):
     published_at = Column(DateTime, index=True)
     report_type = Column(String(100))  # speech, outlook, minutes, research
 
-    # 내용
-    raw_text = Column(Text)  # 원본 텍스트
+    # 내용 (원본 텍스트는 MacroReportBlob 사이드 테이블에 저장)
     cleaned_text = Column(Text)  # 정제된 텍스트
     summary = Column(Text)  # LLM 요약 (선택)
     page_count = Column(Integer)
@@ -279,11 +375,22 @@ class MacroReport(Base):
 
     # 메타데이터
     author = Column(String(200))
-    tags = Column(JSON)  # ["monetary_policy", "inflation", ...]
+    tags = Column(JSONType)  # ["monetary_policy", "inflation", ...]
     is_relevant = Column(Boolean, default=True)  # LLM 필터 결과
     is_processed = Column(Boolean, default=False)
 
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
+
+    blob = relationship("MacroReportBlob", uselist=False, lazy="raise",
+                        cascade="all, delete-orphan")
+
+
+class MacroReportBlob(Base):
+    """매크로 보고서 원본 텍스트 (macro_reports 1:1 사이드 테이블)"""
+    __tablename__ = "macro_report_blobs"
+
+    report_id = Column(Integer, ForeignKey("macro_reports.id"), primary_key=True)
+    raw_text = Column(Text)  # 원본 텍스트
 
 
 class MacroIndicator(Base):
@@ -292,6 +399,10 @@ class MacroIndicator(Base):
     __table_args__ = (
         UniqueConstraint("series_id", "date", name="uq_macro_ind_date"),
         Index("ix_macro_ind_series", "series_id", "date"),
+        Index("ix_macro_ind_date_brin", "date",
+              postgresql_using="brin").ddl_if(dialect="postgresql"),
+        # PostgreSQL: date 기준 분기별 RANGE 파티션 (partitioning.py)
+        {"postgresql_partition_by": "RANGE (date)", "info": {"partition_key": "date"}},
     )
 
     id = Column(Integer, primary_key=True)
@@ -303,7 +414,7 @@ class MacroIndicator(Base):
     frequency = Column(String(20))  # daily, monthly, quarterly
     source = Column(String(50), default="fred")
 
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
 
 
 # ═══════════════════════════════════════════
@@ -343,7 +454,7 @@ class SupplyDemandData(Base):
     volume = Column(Float)                # 거래량
     trading_value = Column(Float)         # 거래대금
     
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     stock = relationship("Stock")
 
@@ -377,7 +488,7 @@ class DisclosureData(Base):
     disclosure_type = Column(String(100), index=True)           # 공시 유형 (실적, 증자, 자사주 등)
     disclosure_category = Column(String(50))                    # 대분류 (major, regular 등)
     
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     stock = relationship("Stock")
 
@@ -415,7 +526,7 @@ class ResearchReport(Base):
     
     # 메타데이터
     is_processed = Column(Boolean, default=False)   # AI 분석 여부
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     stock = relationship("Stock")
 
@@ -454,11 +565,25 @@ class BlogPost(Base):
     
     # 메타데이터
     is_processed = Column(Boolean, default=False)      # AI 분석 여부
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     
     stock = relationship("Stock")
 
 
+# ═══════════════════════════════════════════
+# Derived: Sector Aggregates
+# ═══════════════════════════════════════════
+class SectorMetrics(Base):
+    """업종별 시총 상위 종목 지표 (peer_analysis.refresh_sector_metrics 가 주기적으로 갱신)"""
+    __tablename__ = "sector_metrics"
+
+    sector = Column(String(100), primary_key=True)
+    # 시총 내림차순 상위 PEER_LIMIT + 1 종목:
+    # [{"ticker", "name", "market_cap", "pe", "pb", "debt_ratio", "roe"}, ...]
+    peers = Column(JSONType, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow(), onupdate=datetime.utcnow)
+
+
 # ═══════════════════════════════════════════
 # Pipeline Tracking
 # ═══════════════════════════════════════════
@@ -469,8 +594,8 @@ class PipelineRun(Base):
     id = Column(Integer, primary_key=True)
     pipeline_name = Column(String(50), nullable=False)  # news, fundamentals, dynamics, macro
     status = Column(String(20), nullable=False)  # running, success, failed
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, default=datetime.utcnow, server_default=utcnow())
     finished_at = Column(DateTime)
-    records_collected = Column(Integer, default=0)
+    records_collected = Column(Integer, default=0)  # 종료 시 1회 기록 (BaseCollector._finish_run)
     error_message = Column(Text)
-    config_snapshot = Column(JSON)  # 실행 시 설정 스냅샷
+    config_snapshot = Column(JSONType)  # 실행 시 설정 스냅샷
@@ -0,0 +1,92 @@
+"""PostgreSQL 시계열 테이블 파티셔닝
+
+price_data(월 단위), macro_indicators(분기 단위)를 date 기준 RANGE 파티션으로 생성한다.
+최근 구간 조회 시 플래너가 단일 파티션만 스캔하도록 하기 위함.
+
+- 모델의 __table_args__ 에 postgresql_partition_by 와 info["partition_key"] 를 지정
+- PostgreSQL은 파티션 테이블의 PK에 파티션 키가 포함되어야 하므로,
+  DDL 컴파일 시에만 PK에 date 컬럼을 덧붙인다 (ORM 매핑은 id 단일 PK 유지)
+- SQLite 등 다른 DB에서는 일반 테이블로 생성됨
+"""
+import logging
+from datetime import date
+
+from sqlalchemy import PrimaryKeyConstraint, text
+from sqlalchemy.ext.compiler import compiles
+
+logger = logging.getLogger("marketsense")
+
+# 파티션 생성 시작일 (이전 데이터는 DEFAULT 파티션으로)
+PARTITION_START = date(2020, 1, 1)
+
+# 테이블명 → 파티션 간격(개월)
+PARTITION_MONTHS = {
+    "price_data": 1,
+    "macro_indicators": 3,
+}
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _compile_partitioned_pk(constraint, compiler, **kw):
+    """파티션 테이블의 PK에 파티션 키 추가"""
+    ddl = compiler.visit_primary_key_constraint(constraint, **kw)
+    table = constraint.table
+    key = table.info.get("partition_key") if table is not None else None
+    if key and key not in constraint.columns.keys() and ddl.endswith(")"):
+        ddl = f"{ddl[:-1]}, {compiler.preparer.quote(key)})"
+    return ddl
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _partition_suffix(start: date, months: int) -> str:
+    if months == 3:
+        return f"{start.year}q{(start.month - 1) // 3 + 1}"
+    return f"{start.year}m{start.month:02d}"
+
+
+def partition_ranges(months: int, start: date = PARTITION_START, end: date = None):
+    """[start, end) 구간을 months 간격 (suffix, from, to) 리스트로 분할"""
+    if end is None:
+        end = date(date.today().year + 2, 1, 1)
+    ranges = []
+    cur = start
+    while cur < end:
+        nxt = _add_months(cur, months)
+        ranges.append((_partition_suffix(cur, months), cur, nxt))
+        cur = nxt
+    return ranges
+
+
+def create_partitions(engine, end: date = None) -> int:
+    """PostgreSQL이면 시계열 테이블 파티션 생성 (멱등). 생성 시도한 파티션 수 반환"""
+    if engine.dialect.name != "postgresql":
+        return 0
+
+    count = 0
+    with engine.begin() as conn:
+        for table, months in PARTITION_MONTHS.items():
+            is_partitioned = conn.execute(text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"
+            ), {"t": table}).first()
+            if not is_partitioned:
+                # 파티셔닝 도입 전 생성된 기존 테이블은 마이그레이션 전까지 그대로 사용
+                logger.warning(f"{table}: 파티션 테이블이 아님 - 파티션 생성 건너뜀")
+                continue
+
+            for suffix, start, stop in partition_ranges(months, end=end):
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_{suffix} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{stop.isoformat()}')"
+                ))
+                count += 1
+            # 범위 밖 데이터 수용 (범위 파티션보다 나중에 생성해야 행 이동이 없음)
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+            ))
+
+    logger.info(f"시계열 파티션 {count}개 확인/생성 완료")
+    return count
@@ -7,16 +7,20 @@ import sys
 import logging
 import re
 import os
+import threading
+from functools import cached_property
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
+from sqlalchemy import bindparam, case, func, or_, select
 
 # .env 파일 로드 (최우선)
 load_dotenv()
 
 from src.storage.database import init_db
 from src.storage.models import Stock
-from src.utils.helpers import load_config
+from src.utils.helpers import load_config, is_pid_file_alive, is_process_running
 from src.notifications.telegram_notifier import get_notifier
+from src.bot_tasks import enqueue
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,14 +28,108 @@ logging.basicConfig(
 )
 logger = logging.getLogger("telegram_bot")
 
+# realtime_monitor.PID_FILE 과 동일 (봇 기동 시 KIS 모듈 import 방지)
+MONITOR_PID_FILE = "data/realtime_monitor.pid"
+
+# get_stock_info 조회문 (모듈 로드 시 1회 생성, 컴파일 캐시 재사용)
+_STOCK_COLUMNS = (Stock.ticker, Stock.name, Stock.market_cap)
+# 종목코드 일치 > 종목명 접두사 > 종목명 포함 순으로 1건 (단일 쿼리, pg_trgm 인덱스 사용)
+_STOCK_LOOKUP = (
+    select(*_STOCK_COLUMNS)
+    .where(or_(
+        Stock.ticker == bindparam('ticker'),
+        Stock.name.ilike(bindparam('contains')),
+    ))
+    .order_by(case(
+        (Stock.ticker == bindparam('ticker'), 0),
+        (Stock.name.ilike(bindparam('prefix')), 1),
+        else_=2,
+    ))
+    .limit(1)
+)
+
+DISCLAIMER = "_※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세요._"
+
+MAX_PRICE_QUERIES = 10  # /시세 다종목 조회 최대 개수
+
+# 등락 부호(-1/0/+1) + 1 → 이모지
+CHANGE_EMOJI = ('📉', '➡️', '📈')
+
+# 분석 결과 한글 표기
+SIGNAL_KR = {'BUY': '매수', 'SELL': '매도', 'HOLD': '보유'}
+TREND_KR = {'uptrend': '상승', 'downtrend': '하락', 'sideways': '횡보'}
+VALUATION_KR = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
+
+
+def _valuation_label(fund: dict) -> str:
+    val = fund.get('valuation', 'N/A')
+    if isinstance(val, dict):
+        val = val.get('rating', 'N/A')
+    return VALUATION_KR.get(val, val)
+
+
+# /분석 에이전트별 메시지 구성
+# (결과 키, 아이콘, 이름, 항목명, 간략 항목명, 값 추출)
+ANALYSIS_SECTIONS = (
+    ('news', '📰', '뉴스', None, None, None),
+    ('fundamentals', '💰', '펀더멘털', '밸류에이션', '', _valuation_label),
+    ('dynamics', '📈', '기술적/수급', '추세', '', lambda r: TREND_KR.get(r.get('trend'), 'N/A')),
+    ('macro', '🌍', '거시경제', '거시경제 점수', '점수: ', lambda r: r.get('macro_score', 0)),
+)
+
+
+def _render_section(result: dict, section: tuple, brief: bool = False) -> str:
+    """ANALYSIS_SECTIONS 항목 하나를 메시지로 변환"""
+    _, icon, name, label, brief_label, value_fn = section
+    
+    if brief:
+        suffix = f" ({brief_label}{value_fn(result)})" if value_fn else ""
+        return f"{icon} **{name}**{suffix}\n\n{result.get('summary', '데이터 없음')}"
+    
+    title = f"{icon} **{name} 애널리스트 분석**"
+    if not result or result.get('error'):
+        return f"{title}\n\n데이터 없음"
+    
+    field = f"**{label}**: {value_fn(result)}\n\n" if value_fn else ""
+    return f"{title}\n\n{field}{result.get('summary', '데이터 없음')}"
+
 
 class TelegramBot:
     """Telegram 명령어 봇"""
     
+    HELP_TEXT = """
+📖 **MarketSenseAI 명령어**
+
+**종목 분석:**
+• `/분석 삼성전자` - 종목 AI 분석
+• `/시세 005930` - 실시간 시세 조회
+• `/시세 005930 000660 035720` - 여러 종목 시세
+
+**백테스팅:**
+• `/백테스팅 삼성전자` - 1년 백테스팅
+• `/백테스팅 005930 2년` - 2년 백테스팅
+
+**포트폴리오:**
+• `/포트폴리오 50` - 상위 50개 최적화
+• `/포트폴리오 삼성전자 SK하이닉스 현대차` - 특정 종목
+
+**유틸리티:**
+• `/종목검색 삼성` - 종목 검색
+• `/상태` - 시스템 상태
+• `/도움말` - 이 메시지
+
+**예시:**
+```
+/분석 005930
+/시세 삼성전자
+/백테스팅 SK하이닉스 1년
+/포트폴리오 100
+```
+"""
+    
     def __init__(self):
-        self.config = load_config()
-        self.db = init_db(self.config)
-        self.notifier = get_notifier()
+        # 설정/DB/알림/에이전트는 해당 명령에서 처음 사용할 때 생성 (cached_property)
+        # 봇은 메시지마다 새 프로세스로 실행되므로 /도움말 등은 DB 연결 없이 응답
         
         # 명령어 목록
         self.commands = {
@@ -43,6 +141,41 @@ class TelegramBot:
             '/종목검색': self.cmd_search,
             '/상태': self.cmd_status,
         }
+        self._command_re = re.compile(
+            '(' + '|'.join(map(re.escape, self.commands)) + ')(.*)', re.DOTALL
+        )
+    
+    @cached_property
+    def config(self) -> dict:
+        return load_config()
+    
+    @cached_property
+    def db(self):
+        return init_db(self.config)
+    
+    @cached_property
+    def notifier(self):
+        return get_notifier()
+    
+    @cached_property
+    def signal_agent(self):
+        """SignalAgent (API 키 누락 등으로 생성 실패 시 None → /분석 비활성)"""
+        try:
+            from src.agents import SignalAgent
+            return SignalAgent(self.config, self.db)
+        except Exception as e:
+            logger.warning(f"SignalAgent 초기화 실패 (/분석 비활성): {e}")
+            return None
+    
+    @cached_property
+    def monitor(self):
+        """RealtimeMonitor (생성 실패 시 None → /시세 비활성)"""
+        try:
+            from src.realtime_monitor import RealtimeMonitor
+            return RealtimeMonitor()
+        except Exception as e:
+            logger.warning(f"RealtimeMonitor 초기화 실패 (/시세 비활성): {e}")
+            return None
     
     def parse_command(self, message: str) -> tuple:
         """메시지에서 명령어 파싱
@@ -55,11 +188,10 @@ class TelegramBot:
         """
         message = message.strip()
         
-        # 명령어 찾기
-        for cmd in self.commands.keys():
-            if message.startswith(cmd):
-                args = message[len(cmd):].strip()
-                return (cmd, args)
+        # 명령어 찾기 (전체 명령어 접두사를 한 번에 매칭)
+        m = self._command_re.match(message)
+        if m:
+            return (m.group(1), m.group(2).strip())
         
         return (None, message)
     
@@ -73,54 +205,20 @@ class TelegramBot:
             {'ticker': ..., 'name': ...} or None
         """
         with self.db.get_session() as session:
-            # 종목코드로 조회
-            stock = session.query(Stock).filter_by(ticker=query).first()
-            
-            if not stock:
-                # 종목명으로 조회
-                stock = session.query(Stock).filter(
-                    Stock.name.like(f'%{query}%')
-                ).first()
-            
-            if stock:
-                return {
-                    'ticker': stock.ticker,
-                    'name': stock.name,
-                    'market_cap': stock.market_cap
-                }
+            row = session.execute(_STOCK_LOOKUP, {
+                'ticker': query,
+                'prefix': f'{query}%',
+                'contains': f'%{query}%',
+            }).first()
+        
+        if row:
+            return dict(row._mapping)
         
         return None
     
     def cmd_help(self, args: str) -> str:
         """도움말"""
-        return """
-📖 **MarketSenseAI 명령어**
-
-**종목 분석:**
-• `/분석 삼성전자` - 종목 AI 분석
-• `/시세 005930` - 실시간 시세 조회
-
-**백테스팅:**
-• `/백테스팅 삼성전자` - 1년 백테스팅
-• `/백테스팅 005930 2년` - 2년 백테스팅
-
-**포트폴리오:**
-• `/포트폴리오 50` - 상위 50개 최적화
-• `/포트폴리오 삼성전자 SK하이닉스 현대차` - 특정 종목
-
-**유틸리티:**
-• `/종목검색 삼성` - 종목 검색
-• `/상태` - 시스템 상태
-• `/도움말` - 이 메시지
-
-**예시:**
-```
-/분석 005930
-/시세 삼성전자
-/백테스팅 SK하이닉스 1년
-/포트폴리오 100
-```
-"""
+        return self.HELP_TEXT
     
     def cmd_analyze(self, args: str) -> str:
         """종목 분석 (4개 에이전트 전체)"""
@@ -135,261 +233,61 @@ class TelegramBot:
         ticker = stock['ticker']
         name = stock['name']
         
-        # SignalAgent로 4개 에이전트 병렬 실행 + 통합
-        from src.agents import SignalAgent
+        if self.signal_agent is None:
+            return "❌ AI 분석 기능이 비활성화되어 있습니다. (GOOGLE_API_KEY 확인)"
+        
+        # 사용자 chat_id 가 있으면 에이전트별 개별 메시지로 전송
+        user_chat_id = os.getenv("TELEGRAM_USER_CHAT_ID")
+        header_sender = None
         
         try:
-            # SignalAgent.analyze()가 4개 에이전트를 병렬로 실행하고 통합합니다
-            logger.info(f"[SignalAgent] {ticker} 종합 분석 시작 (4개 에이전트 병렬)")
-            signal_agent = SignalAgent(self.config, self.db)
-            full_result = signal_agent.analyze(ticker)
-            
-            # 각 에이전트 결과 추출
-            agent_results = full_result.get('agent_results', {})
-            results = {
-                'news': agent_results.get('news', {}),
-                'fundamentals': agent_results.get('fundamentals', {}),
-                'dynamics': agent_results.get('dynamics', {}),
-                'macro': agent_results.get('macro', {}),
-                'signal': full_result
-            }
-            
-            # 결과 포맷팅
-            signal_kr = {'BUY': '매수', 'SELL': '매도', 'HOLD': '보유'}
-            risk_kr = {'low': '낮음', 'medium': '보통', 'high': '높음'}
-            
-            signal_result = results['signal']
-            news_result = results.get('news', {})
-            fund_result = results.get('fundamentals', {})
-            dyn_result = results.get('dynamics', {})
-            
-            # 기술적 분석 상세 포맷팅
-            tech_detail = ""
-            if dyn_result and not dyn_result.get('error'):
-                # 추세
-                trend_kr = {'uptrend': '상승 추세', 'downtrend': '하락 추세', 'sideways': '횡보'}
-                tech_detail = f"• 추세: {trend_kr.get(dyn_result.get('trend'), dyn_result.get('trend', 'N/A'))}"
-                
-                if dyn_result.get('trend_strength'):
-                    strength_kr = {'strong': '강함', 'moderate': '보통', 'weak': '약함'}
-                    tech_detail += f" ({strength_kr.get(dyn_result.get('trend_strength'), dyn_result.get('trend_strength'))})"
-                
-                # 이동평균선
-                if dyn_result.get('moving_averages'):
-                    ma = dyn_result['moving_averages']
-                    tech_detail += f"\n• 이평선: {ma.get('ma5_vs_ma20', 'N/A')}"
-                
-                # RSI
-                if dyn_result.get('indicators', {}).get('rsi'):
-                    rsi_data = dyn_result['indicators']['rsi']
-                    rsi_status_kr = {'과매수': '과매수', '중립': '중립', '과매도': '과매도'}
-                    tech_detail += f"\n• RSI: {rsi_data.get('value', 'N/A')} ({rsi_status_kr.get(rsi_data.get('status'), rsi_data.get('status', 'N/A'))})"
-                
-                # MACD
-                if dyn_result.get('indicators', {}).get('macd'):
-                    macd_data = dyn_result['indicators']['macd']
-                    macd_signal_kr = {'매수': '매수', '매도': '매도', '중립': '중립'}
-                    tech_detail += f"\n• MACD: {macd_signal_kr.get(macd_data.get('signal'), macd_data.get('signal', 'N/A'))}"
-                
-                # 거래량
-                if dyn_result.get('indicators', {}).get('volume'):
-                    vol_data = dyn_result['indicators']['volume']
-                    vol_trend_kr = {'증가': '증가', '감소': '감소', '보합': '보합'}
-                    tech_detail += f"\n• 거래량: {vol_trend_kr.get(vol_data.get('trend'), vol_data.get('trend', 'N/A'))}"
-                
-                # 지지/저항선
-                if dyn_result.get('key_levels'):
-                    levels = dyn_result['key_levels']
-                    if levels.get('support'):
-                        supports = [f"{int(s):,}" for s in levels['support'][:2]]
-                        tech_detail += f"\n• 지지선: {', '.join(supports)}원"
-                    if levels.get('resistance'):
-                        resistances = [f"{int(r):,}" for r in levels['resistance'][:2]]
-                        tech_detail += f"\n• 저항선: {', '.join(resistances)}원"
-                
-                # 매매 전략
-                if dyn_result.get('trading_strategy'):
-                    strategy = dyn_result['trading_strategy']
-                    if strategy.get('target_price'):
-                        tech_detail += f"\n• 목표가: {strategy['target_price']}"
-            else:
-                tech_detail = "• 데이터 없음"
-            
-            # 재무 분석 상세 포맷팅
-            fund_detail = ""
-            if fund_result and not fund_result.get('error'):
-                # 밸류에이션
-                valuation_kr = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
-                if isinstance(fund_result.get('valuation'), dict):
-                    val = fund_result['valuation']
-                    fund_detail = f"• 밸류에이션: {valuation_kr.get(val.get('rating'), val.get('rating', 'N/A'))}"
-                    
-                    if val.get('vs_sector_pe'):
-                        fund_detail += f"\n• 업종 대비 P/E: {val['vs_sector_pe']}"
-                    if val.get('upside_potential'):
-                        fund_detail += f"\n• 상승여력: {val['upside_potential']}"
-                else:
-                    fund_detail = f"• 밸류에이션: {valuation_kr.get(fund_result.get('valuation'), fund_result.get('valuation', 'N/A'))}"
-                
-                # 수익성
-                if fund_result.get('profitability'):
-                    prof = fund_result['profitability']
-                    rating_kr = {'excellent': '우수', 'good': '양호', 'fair': '보통', 'poor': '부진'}
-                    fund_detail += f"\n• 수익성: {rating_kr.get(prof.get('rating'), prof.get('rating', 'N/A'))}"
-                    
-                    if prof.get('roe'):
-                        fund_detail += f" (ROE {prof['roe']:.1f}%)"
-                
-                # 성장성
-                if fund_result.get('growth'):
-                    growth = fund_result['growth']
-                    growth_kr = {'high': '높음', 'moderate': '보통', 'low': '낮음', 'negative': '마이너스'}
-                    fund_detail += f"\n• 성장성: {growth_kr.get(growth.get('rating'), growth.get('rating', 'N/A'))}"
-                    
-                    if growth.get('revenue_growth_yoy'):
-                        fund_detail += f" (매출 YoY {growth['revenue_growth_yoy']:+.1f}%)"
-                
-                # 안정성
-                if fund_result.get('stability'):
-                    stab = fund_result['stability']
-                    stab_kr = {'strong': '우수', 'moderate': '보통', 'weak': '약함', 'risky': '주의'}
-                    fund_detail += f"\n• 재무안정성: {stab_kr.get(stab.get('rating'), stab.get('rating', 'N/A'))}"
-                    
-                    if stab.get('debt_ratio'):
-                        fund_detail += f" (부채비율 {stab['debt_ratio']:.1f}%)"
-                
-                # 현금흐름
-                if fund_result.get('cash_flow'):
-                    cf = fund_result['cash_flow']
-                    cf_kr = {'strong': '우수', 'adequate': '양호', 'weak': '약함'}
-                    fund_detail += f"\n• 현금흐름: {cf_kr.get(cf.get('rating'), cf.get('rating', 'N/A'))}"
-                
-                # 투자 의견
-                if fund_result.get('investment_thesis'):
-                    thesis = fund_result['investment_thesis']
-                    if thesis.get('target_price'):
-                        fund_detail += f"\n• 목표가: {thesis['target_price']}"
-            else:
-                fund_detail = f"• 밸류에이션: {fund_result.get('valuation', 'N/A')}\n• 요약: {fund_result.get('summary', '데이터 없음')[:100]}..."
-            
-            # 각 에이전트 분석을 개별 메시지로 사용자에게 전송
-            # 사용자 chat_id 가져오기
-            user_chat_id = os.getenv("TELEGRAM_USER_CHAT_ID")
-            
-            if not user_chat_id:
-                # chat_id 없으면 한 메시지로 통합 반환 (fallback)
-                response_parts = []
-                response_parts.append(f"🤖 **AI 종합 분석**\n\n**종목**: {name} ({ticker})\n\n━━━━━━━━━━━━━━━━━━━━━━")
-                
-                if news_result and not news_result.get('error'):
-                    response_parts.append(f"📰 **뉴스**\n\n{news_result.get('summary', '데이터 없음')}")
-                
-                if fund_result and not fund_result.get('error'):
-                    valuation_info = "N/A"
-                    if isinstance(fund_result.get('valuation'), dict):
-                        val = fund_result['valuation']
-                        valuation_kr = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
-                        valuation_info = valuation_kr.get(val.get('rating'), val.get('rating', 'N/A'))
-                    else:
-                        valuation_kr = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
-                        valuation_info = valuation_kr.get(fund_result.get('valuation'), fund_result.get('valuation', 'N/A'))
-                    response_parts.append(f"💰 **펀더멘털** ({valuation_info})\n\n{fund_result.get('summary', '데이터 없음')}")
-                
-                if dyn_result and not dyn_result.get('error'):
-                    trend_kr = {'uptrend': '상승', 'downtrend': '하락', 'sideways': '횡보'}
-                    response_parts.append(f"📈 **기술적/수급** ({trend_kr.get(dyn_result.get('trend'), 'N/A')})\n\n{dyn_result.get('summary', '데이터 없음')}")
-                
-                macro_result = results.get('macro')
-                if macro_result and not macro_result.get('error'):
-                    response_parts.append(f"🌍 **거시경제** (점수: {macro_result.get('macro_score', 0)})\n\n{macro_result.get('summary', '데이터 없음')}")
-                
-                response_parts.append(f"━━━━━━━━━━━━━━━━━━━━━━\n\n🎯 **CIO 최종 의견**\n\n**신호**: {signal_kr.get(signal_result.get('signal'), signal_result.get('signal'))}\n**확신도**: {signal_result.get('confidence', 0)*100:.0f}%\n\n{signal_result.get('summary', 'N/A')}\n\n━━━━━━━━━━━━━━━━━━━━━━\n\n⏰ {signal_result.get('analyzed_at', '')}\n\n_※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세요._")
-                
-                return '\n\n'.join(response_parts)
-            
-            # 1. 헤더
-            header_msg = f"""🤖 **AI 종합 분석**
+            if user_chat_id:
+                # 헤더는 분석과 동시에 전송 (결과 메시지보다 항상 먼저 도착)
+                header_msg = f"""🤖 **AI 종합 분석**
 
 **종목**: {name} ({ticker})
 
 ━━━━━━━━━━━━━━━━━━━━━━
 분석을 시작합니다..."""
-            self.notifier.send_to_user(user_chat_id, header_msg)
+                header_sender = threading.Thread(
+                    target=self.notifier.send_to_user, args=(user_chat_id, header_msg)
+                )
+                header_sender.start()
             
-            # 2. 뉴스 분석
-            if news_result and not news_result.get('error'):
-                news_summary = news_result.get('summary', '데이터 없음')
-                news_msg = f"""📰 **뉴스 애널리스트 분석**
-
-{news_summary}"""
-                self.notifier.send_to_user(user_chat_id, news_msg)
-            else:
-                self.notifier.send_to_user(user_chat_id, "📰 **뉴스 애널리스트 분석**\n\n데이터 없음")
+            # SignalAgent.analyze()가 4개 에이전트를 병렬로 실행하고 통합합니다
+            logger.info(f"[SignalAgent] {ticker} 종합 분석 시작 (4개 에이전트 병렬)")
+            full_result = self.signal_agent.analyze(ticker)
             
-            # 3. 재무 분석
-            if fund_result and not fund_result.get('error'):
-                fund_summary = fund_result.get('summary', '데이터 없음')
-                valuation_info = "N/A"
-                if isinstance(fund_result.get('valuation'), dict):
-                    val = fund_result['valuation']
-                    valuation_kr = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
-                    valuation_info = valuation_kr.get(val.get('rating'), val.get('rating', 'N/A'))
-                else:
-                    valuation_kr = {'undervalued': '저평가', 'fair': '적정', 'overvalued': '고평가'}
-                    valuation_info = valuation_kr.get(fund_result.get('valuation'), fund_result.get('valuation', 'N/A'))
-                
-                fund_msg = f"""💰 **펀더멘털 애널리스트 분석**
-
-**밸류에이션**: {valuation_info}
-
-{fund_summary}"""
-                self.notifier.send_to_user(user_chat_id, fund_msg)
-            else:
-                self.notifier.send_to_user(user_chat_id, "💰 **펀더멘털 애널리스트 분석**\n\n데이터 없음")
+            agent_results = full_result.get('agent_results', {})
+            signal_text = (
+                f"**신호**: {SIGNAL_KR.get(full_result.get('signal'), full_result.get('signal'))}\n"
+                f"**확신도**: {full_result.get('confidence', 0)*100:.0f}%\n\n"
+                f"{full_result.get('summary', 'N/A')}\n\n"
+                f"━━━━━━━━━━━━━━━━━━━━━━\n\n"
+                f"⏰ {full_result.get('analyzed_at', '')}\n\n"
+                f"{DISCLAIMER}"
+            )
             
-            # 4. 기술적 분석
-            if dyn_result and not dyn_result.get('error'):
-                dyn_summary = dyn_result.get('summary', '데이터 없음')
-                trend_kr = {'uptrend': '상승', 'downtrend': '하락', 'sideways': '횡보'}
-                
-                dyn_msg = f"""📈 **기술적/수급 애널리스트 분석**
-
-**추세**: {trend_kr.get(dyn_result.get('trend'), 'N/A')}
-
-{dyn_summary}"""
-                self.notifier.send_to_user(user_chat_id, dyn_msg)
-            else:
-                self.notifier.send_to_user(user_chat_id, "📈 **기술적/수급 애널리스트 분석**\n\n데이터 없음")
+            if not user_chat_id:
+                # chat_id 없으면 한 메시지로 통합 반환 (fallback)
+                response_parts = [f"🤖 **AI 종합 분석**\n\n**종목**: {name} ({ticker})\n\n━━━━━━━━━━━━━━━━━━━━━━"]
+                for section in ANALYSIS_SECTIONS:
+                    result = agent_results.get(section[0])
+                    if result and not result.get('error'):
+                        response_parts.append(_render_section(result, section, brief=True))
+                response_parts.append(f"━━━━━━━━━━━━━━━━━━━━━━\n\n🎯 **CIO 최종 의견**\n\n{signal_text}")
+                return '\n\n'.join(response_parts)
             
-            # 5. 거시경제 분석
-            macro_result = results.get('macro')
-            if macro_result and not macro_result.get('error'):
-                macro_summary = macro_result.get('summary', '데이터 없음')
-                
-                macro_msg = f"""🌍 **거시경제 애널리스트 분석**
-
-**거시경제 점수**: {macro_result.get('macro_score', 0)}
-
-{macro_summary}"""
-                self.notifier.send_to_user(user_chat_id, macro_msg)
-            else:
-                self.notifier.send_to_user(user_chat_id, "🌍 **거시경제 애널리스트 분석**\n\n데이터 없음")
+            # 각 에이전트 분석을 개별 메시지로 사용자에게 전송
+            messages = [
+                _render_section(agent_results.get(section[0]), section)
+                for section in ANALYSIS_SECTIONS
+            ]
+            messages.append(f"🎯 **CIO 최종 투자 의견**\n\n{signal_text}")
             
-            # 6. 최종 투자 신호 (CIO)
-            signal_summary = signal_result.get('summary', 'N/A')
-            signal_msg = f"""🎯 **CIO 최종 투자 의견**
-
-**신호**: {signal_kr.get(signal_result.get('signal'), signal_result.get('signal'))}
-**확신도**: {signal_result.get('confidence', 0)*100:.0f}%
-
-{signal_summary}
-
-━━━━━━━━━━━━━━━━━━━━━━
-
-⏰ {signal_result.get('analyzed_at', '')}
-
-_※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세요._"""
-            self.notifier.send_to_user(user_chat_id, signal_msg)
+            # 헤더 전송 완료 후 결과 메시지 일괄 전송 (순서 보장)
+            header_sender.join()
+            self.notifier.send_many_to_user(user_chat_id, messages)
             
             # 완료 메시지 반환 (NO_REPLY로 중복 방지)
             return "NO_REPLY"
@@ -410,7 +308,12 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
         if not args:
             return "❌ 종목을 입력하세요.\n예: `/시세 삼성전자`"
         
-        from src.realtime_monitor import RealtimeMonitor
+        if self.monitor is None:
+            return "❌ 시세 조회 기능이 비활성화되어 있습니다. (KIS API 키 확인)"
+        
+        queries = args.split()
+        if len(queries) > 1:
+            return self._price_list(queries)
         
         # 종목 조회
         stock = self.get_stock_info(args)
@@ -418,8 +321,7 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
             return f"❌ 종목을 찾을 수 없습니다: {args}"
         
         # 실시간 시세 조회
-        monitor = RealtimeMonitor()
-        data = monitor.get_realtime_price(stock['ticker'])
+        data = self.monitor.get_realtime_price(stock['ticker'])
         
         if not data or data['price'] == 0:
             return f"""
@@ -430,7 +332,8 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
 장 마감 또는 데이터 없음
 """
         
-        change_emoji = '📈' if data['change'] > 0 else '📉' if data['change'] < 0 else '➡️'
+        change = data['change']
+        change_emoji = CHANGE_EMOJI[(change > 0) - (change < 0) + 1]
         
         return f"""
 {change_emoji} **실시간 시세**
@@ -443,24 +346,59 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
 ⏰ {data['time']}
 """
     
+    def _price_list(self, queries: List[str]) -> str:
+        """여러 종목 시세를 동시 조회하여 한 메시지로 반환"""
+        if len(queries) > MAX_PRICE_QUERIES:
+            return f"❌ 한 번에 최대 {MAX_PRICE_QUERIES}개 종목까지 조회할 수 있습니다."
+        
+        stocks, missing = [], []
+        for query in queries:
+            stock = self.get_stock_info(query)
+            if stock:
+                stocks.append(stock)
+            else:
+                missing.append(query)
+        
+        prices = self.monitor.get_realtime_prices([s['ticker'] for s in stocks])
+        
+        lines = ["📊 **실시간 시세**", ""]
+        for stock, data in zip(stocks, prices):
+            if not data or data['price'] == 0:
+                lines.append(f"⚠️ {stock['name']} ({stock['ticker']}): 데이터 없음")
+                continue
+            change = data['change']
+            lines.append(
+                f"{CHANGE_EMOJI[(change > 0) - (change < 0) + 1]} {stock['name']} ({stock['ticker']}): "
+                f"{data['price']:,.0f}원 ({data['change_rate']:+.2f}%)"
+            )
+        if missing:
+            lines += ["", f"❌ 찾을 수 없음: {', '.join(missing)}"]
+        
+        times = [data['time'] for data in prices if data]
+        if times:
+            lines += ["", f"⏰ {max(times)}"]
+        return "\n".join(lines)
+    
     def cmd_backtest(self, args: str) -> str:
         """백테스팅"""
         if not args:
             return "❌ 종목을 입력하세요.\n예: `/백테스팅 삼성전자`"
         
-        # 인자 파싱
-        parts = args.split()
-        query = parts[0]
-        years = 1
-        
-        if len(parts) > 1 and parts[1].replace('년', '').isdigit():
-            years = int(parts[1].replace('년', ''))
+        query, years = self._parse_backtest_args(args)
         
         # 종목 조회
         stock = self.get_stock_info(query)
         if not stock:
             return f"❌ 종목을 찾을 수 없습니다: {query}"
         
+        # 별도 프로세스에서 실행 후 결과 전송 (봇은 즉시 응답)
+        enqueue(
+            'backtest', stock['ticker'],
+            '--name', stock['name'],
+            '--years', str(years),
+            *self._chat_id_args(),
+        )
+        
         return f"""
 🔄 **백테스팅 시작**
 
@@ -472,6 +410,18 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
 완료되면 결과를 보내드립니다.
 """
     
+    @staticmethod
+    def _parse_backtest_args(args: str) -> tuple:
+        """'<종목> [N년]' → (query, years). 공백 문자(탭·줄바꿈 포함) 기준, 앞의 두 토큰만 분리"""
+        parts = args.split(None, 2)
+        if len(parts) < 2:
+            return (parts[0] if parts else ''), 1
+        
+        period = parts[1]
+        if period.endswith('년'):
+            period = period[:-1]
+        return parts[0], int(period) if period.isdecimal() else 1
+    
     def cmd_portfolio(self, args: str) -> str:
         """포트폴리오 최적화"""
         if not args:
@@ -480,6 +430,7 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
         # 숫자인 경우 - 상위 N개
         if args.isdigit():
             n = int(args)
+            enqueue('portfolio', '--top', str(n), *self._chat_id_args())
             return f"""
 🔄 **포트폴리오 최적화 시작**
 
@@ -491,7 +442,14 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
 """
         
         # 종목명인 경우
-        tickers = args.split()
+        tickers = []
+        for query in args.split():
+            stock = self.get_stock_info(query)
+            if not stock:
+                return f"❌ 종목을 찾을 수 없습니다: {query}"
+            tickers.append(stock['ticker'])
+        
+        enqueue('portfolio', '--tickers', *tickers, *self._chat_id_args())
         return f"""
 🔄 **포트폴리오 최적화 시작**
 
@@ -502,50 +460,55 @@ _※ AI 분석은 참고용이며, 실제 투자는 본인 판단으로 하세
 완료되면 결과를 보내드립니다.
 """
     
+    @staticmethod
+    def _chat_id_args() -> List[str]:
+        """백그라운드 작업 결과를 받을 사용자 chat_id 인자"""
+        chat_id = os.getenv("TELEGRAM_USER_CHAT_ID")
+        return ['--chat-id', chat_id] if chat_id else []
+    
     def cmd_search(self, args: str) -> str:
         """종목 검색"""
         if not args:
             return "❌ 검색어를 입력하세요.\n예: `/종목검색 삼성`"
         
+        # 필요한 컬럼만 조회 (ORM 객체 생성 없이 Row 튜플)
         with self.db.get_session() as session:
-            stocks = session.query(Stock).filter(
-                Stock.name.like(f'%{args}%')
+            rows = session.query(
+                Stock.ticker,
+                Stock.name,
+                (Stock.market_cap / 1e12).label('cap_trillion'),
+            ).filter(
+                Stock.name.ilike(f'%{args}%')
             ).limit(10).all()
-            
-            if not stocks:
-                return f"❌ '{args}' 검색 결과가 없습니다."
-            
-            result = f"🔍 **'{args}' 검색 결과** ({len(stocks)}개)\n\n"
-            
-            for s in stocks:
-                market_cap = f"{s.market_cap/1e12:.1f}조원" if s.market_cap else "N/A"
-                result += f"• {s.name} ({s.ticker}) - {market_cap}\n"
-            
-            return result
+        
+        if not rows:
+            return f"❌ '{args}' 검색 결과가 없습니다."
+        
+        result = f"🔍 **'{args}' 검색 결과** ({len(rows)}개)\n\n"
+        
+        for ticker, name, cap_trillion in rows:
+            market_cap = f"{cap_trillion:.1f}조원" if cap_trillion else "N/A"
+            result += f"• {name} ({ticker}) - {market_cap}\n"
+        
+        return result
     
     def cmd_status(self, args: str) -> str:
         """시스템 상태"""
-        import subprocess
-        
-        # 실시간 모니터링 확인
-        try:
-            result = subprocess.run(
-                ["ps", "aux"],
-                capture_output=True,
-                text=True
-            )
-            monitor_running = "realtime_monitor" in result.stdout
-        except:
-            monitor_running = False
+        # 실시간 모니터링 확인 (PID 파일 + signal 0, 없으면 프로세스 목록 검색)
+        monitor_running = (
+            is_pid_file_alive(MONITOR_PID_FILE)
+            or is_process_running("realtime_monitor")
+        )
         
         # 데이터베이스 통계
         with self.db.get_session() as session:
             from src.storage.models import FinancialStatement, NewsArticle, PriceData
             
-            stocks = session.query(Stock).count()
-            financials = session.query(FinancialStatement).count()
-            news = session.query(NewsArticle).count()
-            prices = session.query(PriceData).count()
+            # 테이블별 COUNT 를 스칼라 서브쿼리로 묶어 1회 왕복
+            stocks, financials, news, prices = session.execute(select(*(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (Stock, FinancialStatement, NewsArticle, PriceData)
+            ))).one()
         
         return f"""
 📊 **MarketSenseAI 상태**
@@ -586,7 +549,7 @@ https://github.com/yrbahn/marketsense-ai
         
         # 명령어 없으면 도움말
         if message.startswith('/'):
-            return f"❌ 알 수 없는 명령어: {message}\n\n{self.cmd_help('')}"
+            return f"❌ 알 수 없는 명령어: {message}\n\n{self.HELP_TEXT}"
         
         return None  # 일반 대화는 처리 안 함
 
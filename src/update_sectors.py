@@ -8,6 +8,13 @@ import logging
 from typing import Dict
 import re
 
+try:
+    import ahocorasick  # pyahocorasick (선택) - 없으면 정규식으로 분류
+except ImportError:
+    ahocorasick = None
+
+from sqlalchemy import select
+
 from src.storage.database import init_db
 from src.storage.models import Stock
 from src.utils.helpers import load_config
@@ -37,6 +44,34 @@ SECTOR_KEYWORDS = {
 }
 
 
+SECTOR_BATCH_SIZE = 5000  # 종목 조회 스트리밍 단위
+
+
+# 업종 분류 정규식 (모듈 로드 시 1회 컴파일)
+# 업종별 `(?=.*?(키워드|...))()` 를 SECTOR_KEYWORDS 순서대로 이어붙여,
+# 기존 이중 루프와 같은 우선순위(먼저 정의된 업종 우선)로 한 번에 매칭한다.
+# 매칭된 업종은 빈 캡처 그룹 번호(lastindex)로 식별
+_SECTORS = list(SECTOR_KEYWORDS)
+_SECTOR_RE = re.compile('|'.join(
+    f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))()"
+    for keywords in SECTOR_KEYWORDS.values()
+), re.DOTALL)
+
+
+def _build_sector_automaton():
+    """키워드 → 업종 순번 Aho-Corasick 오토마톤 (종목명 1회 스캔으로 전체 키워드 매칭)"""
+    automaton = ahocorasick.Automaton()
+    for idx, keywords in enumerate(SECTOR_KEYWORDS.values()):
+        for keyword in keywords:
+            if keyword not in automaton:  # 중복 키워드는 먼저 정의된 업종 우선
+                automaton.add_word(keyword, idx)
+    automaton.make_automaton()
+    return automaton
+
+
+_SECTOR_AUTOMATON = _build_sector_automaton() if ahocorasick else None
+
+
 def classify_sector(name: str) -> tuple:
     """종목명으로 업종 분류
     
@@ -46,10 +81,16 @@ def classify_sector(name: str) -> tuple:
     Returns:
         (sector, industry) 튜플
     """
-    for sector, keywords in SECTOR_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in name:
-                return (sector, sector)
+    if _SECTOR_AUTOMATON is not None:
+        # 매칭된 키워드 중 가장 앞선 업종 (정규식 경로와 같은 우선순위)
+        idx = min((i for _, i in _SECTOR_AUTOMATON.iter(name)), default=None)
+    else:
+        m = _SECTOR_RE.match(name)
+        idx = m.lastindex - 1 if m else None
+    
+    if idx is not None:
+        sector = _SECTORS[idx]
+        return (sector, sector)
     
     return ('기타', '기타')
 
@@ -57,29 +98,43 @@ def classify_sector(name: str) -> tuple:
 def update_stock_sectors(db):
     """DB의 종목에 업종 정보 업데이트
     
+    SECTOR_BATCH_SIZE 단위로 조회 → 분류 → UPDATE 를 반복하여
+    메모리 사용량을 테이블 크기가 아닌 배치 크기로 제한한다.
+    
     Args:
         db: 데이터베이스
     """
     logger.info("종목 업종 정보 업데이트 시작...")
     
+    total = updated = 0
+    
     with db.get_session() as session:
-        stocks = session.query(Stock).all()
+        # 필요한 컬럼만 서버 측 커서로 스트리밍
+        result = session.execute(
+            select(Stock.id, Stock.name, Stock.sector, Stock.industry)
+            .execution_options(yield_per=SECTOR_BATCH_SIZE)
+        )
         
-        updated = 0
-        for stock in stocks:
-            sector, industry = classify_sector(stock.name)
-            
-            stock.sector = sector
-            stock.industry = industry
-            
-            updated += 1
+        for batch in result.partitions():
+            total += len(batch)
+            # 국내 상장 종목 수 규모에서는 프로세스 풀 기동 비용이 분류 시간보다 커서 직렬 처리
+            classified = [classify_sector(row.name) for row in batch]
             
-            if updated % 100 == 0:
-                logger.info(f"진행: {updated}/{len(stocks)}")
+            # 분류 결과가 기존 값과 다른 종목만 UPDATE (재실행 시 대부분 건너뜀)
+            mappings = [
+                {'id': row.id, 'sector': new[0], 'industry': new[1]}
+                for row, new in zip(batch, classified)
+                if new != (row.sector, row.industry)
+            ]
+            if mappings:
+                # 변경 추적 없이 PK 기준 일괄 UPDATE (executemany)
+                session.bulk_update_mappings(Stock, mappings)
+                updated += len(mappings)
         
+        # 스트리밍 커서가 닫힌 뒤 한 번에 커밋
         session.commit()
         
-        logger.info(f"✅ {updated}/{len(stocks)}개 종목 업종 정보 업데이트 완료")
+    logger.info(f"✅ {updated}/{total}개 종목 업종 정보 업데이트 완료 (나머지 변경 없음)")
 
 
 def main():
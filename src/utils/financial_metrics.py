@@ -2,6 +2,81 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+
+
+_NO_DATA = {}  # raw_data 가 없는 재무제표 (읽기 전용으로만 사용)
+
+# 4분기 가로 표시에 사용하는 raw_data 키
+HORIZONTAL_KEYS = (
+    'revenue', 'operating_income', 'net_income', 'operating_margin', 'net_margin',
+    'total_assets', 'total_liabilities', 'total_equity', 'debt_ratio',
+    'operating_cash_flow', 'investing_cash_flow', 'financing_cash_flow',
+    'roe', 'roa',
+)
+
+
+# 값 표시 형식 (원 → 억 단위 / 비율)
+VALUE_FORMATS = {
+    'money': lambda v: f"{v/100000000:.0f}억",
+    'signed': lambda v: f"{v/100000000:+.0f}억",
+    'pct': lambda v: f"{v:.1f}%",
+}
+
+# 4분기 가로 표시 항목: (섹션, ((키, 아이콘, 이름, 표시 형식), ...))
+HORIZONTAL_SECTIONS = (
+    ('손익계산서', (
+        ('revenue', '📈', '매출액', 'money'),
+        ('operating_income', '💰', '영업이익', 'money'),
+        ('net_income', '💵', '당기순이익', 'money'),
+        ('operating_margin', '📊', '영업이익률', 'pct'),
+        ('net_margin', '💹', '순이익률', 'pct'),
+    )),
+    ('재무상태표', (
+        ('total_assets', '🏦', '자산총계', 'money'),
+        ('total_liabilities', '📋', '부채총계', 'money'),
+        ('total_equity', '💼', '자본총계', 'money'),
+        ('debt_ratio', '⚖️', '부채비율', 'pct'),
+    )),
+    ('현금흐름표', (
+        ('operating_cash_flow', '💸', '영업활동CF', 'signed'),
+        ('investing_cash_flow', '🏗️', '투자활동CF', 'signed'),
+        ('financing_cash_flow', '🏛️', '재무활동CF', 'signed'),
+        ('free_cash_flow', '💎', '잉여현금흐름(FCF)', 'signed'),
+    )),
+    ('수익성 지표', (
+        ('roe', '📊', 'ROE', 'pct'),
+        ('roa', '📈', 'ROA', 'pct'),
+    )),
+)
+
+# 증감률(%) / 차이(%p) / 추세 분석 대상 지표
+CHANGE_METRICS = (
+    'revenue', 'operating_income', 'net_income',
+    'total_assets', 'total_equity', 'operating_cash_flow',
+    'investing_cash_flow', 'financing_cash_flow',
+)
+RATIO_METRICS = ('roe', 'roa', 'operating_margin', 'net_margin', 'debt_ratio')
+TREND_METRICS = (
+    'revenue', 'operating_income', 'net_income',
+    'roe', 'operating_margin', 'operating_cash_flow',
+)
+
+# 증감률 / 추세 요약에 표시하는 지표 이름
+METRIC_LABELS = {
+    'revenue': '매출',
+    'operating_income': '영업이익',
+    'net_income': '순이익',
+    'roe': 'ROE',
+    'operating_margin': '영업이익률',
+    'operating_cash_flow': '영업CF',
+}
+GROWTH_SUMMARY_METRICS = ('revenue', 'operating_income', 'net_income', 'operating_cash_flow')
+DIFF_SUMMARY_METRICS = ('roe', 'operating_margin')  # QoQ 에만 %p 차이 표시
+
+SEPARATOR = "━" * 55
+REPORT_HEADER = f"\n{SEPARATOR}\n📊 4분기 연속 모든 지표 추세 (지표별 가로 배치)\n{SEPARATOR}"
+
 
 def format_quarterly_metrics_horizontal(statements: List[Any]) -> str:
     """모든 지표를 4분기 연속으로 가로로 표시
@@ -15,244 +90,90 @@ def format_quarterly_metrics_horizontal(statements: List[Any]) -> str:
     if len(statements) < 4:
         return ""
     
-    lines = ["\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"]
-    lines.append("📊 4분기 연속 모든 지표 추세 (지표별 가로 배치)")
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    # raw_data 는 분기당 한 번만 읽고, 가로 표시·증감률 계산에 함께 사용
+    rds = _raw_data(statements[:5])
     
-    # 분기 레이블 생성
+    # 최근 4분기 (오래된 순) 분기 레이블과 지표 원값을 한 번에 수집
     periods = []
-    for stmt in reversed(statements[:4]):
-        year = stmt.period_end.year
-        quarter = (stmt.period_end.month - 1) // 3 + 1
-        periods.append(f"{year}-Q{quarter}")
-    
-    lines.append(f"\n기간: {' → '.join(periods)}")
-    lines.append("")
-    
-    # === 손익계산서 ===
-    lines.append("【손익계산서】")
-    
-    # 매출액
-    revenues = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('revenue'):
-            revenues.append(f"{stmt.raw_data['revenue']/100000000:.0f}억")
-        else:
-            revenues.append("N/A")
-    if any(r != "N/A" for r in revenues):
-        lines.append(f"  📈 매출액: {' → '.join(revenues)}")
-    
-    # 영업이익
-    op_incomes = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('operating_income'):
-            op_incomes.append(f"{stmt.raw_data['operating_income']/100000000:.0f}억")
-        else:
-            op_incomes.append("N/A")
-    if any(oi != "N/A" for oi in op_incomes):
-        lines.append(f"  💰 영업이익: {' → '.join(op_incomes)}")
-    
-    # 당기순이익
-    net_incomes = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('net_income'):
-            net_incomes.append(f"{stmt.raw_data['net_income']/100000000:.0f}억")
-        else:
-            net_incomes.append("N/A")
-    if any(ni != "N/A" for ni in net_incomes):
-        lines.append(f"  💵 당기순이익: {' → '.join(net_incomes)}")
-    
-    # 영업이익률
-    op_margins = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('operating_margin'):
-            op_margins.append(f"{stmt.raw_data['operating_margin']:.1f}%")
-        else:
-            op_margins.append("N/A")
-    if any(om != "N/A" for om in op_margins):
-        lines.append(f"  📊 영업이익률: {' → '.join(op_margins)}")
-    
-    # 순이익률
-    net_margins = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('net_margin'):
-            net_margins.append(f"{stmt.raw_data['net_margin']:.1f}%")
-        else:
-            net_margins.append("N/A")
-    if any(nm != "N/A" for nm in net_margins):
-        lines.append(f"  💹 순이익률: {' → '.join(net_margins)}")
-    
-    # === 재무상태표 ===
-    lines.append("\n【재무상태표】")
-    
-    # 자산총계
-    total_assets = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('total_assets'):
-            total_assets.append(f"{stmt.raw_data['total_assets']/100000000:.0f}억")
-        else:
-            total_assets.append("N/A")
-    if any(ta != "N/A" for ta in total_assets):
-        lines.append(f"  🏦 자산총계: {' → '.join(total_assets)}")
-    
-    # 부채총계
-    total_liabs = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('total_liabilities'):
-            total_liabs.append(f"{stmt.raw_data['total_liabilities']/100000000:.0f}억")
-        else:
-            total_liabs.append("N/A")
-    if any(tl != "N/A" for tl in total_liabs):
-        lines.append(f"  📋 부채총계: {' → '.join(total_liabs)}")
-    
-    # 자본총계
-    total_equity = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('total_equity'):
-            total_equity.append(f"{stmt.raw_data['total_equity']/100000000:.0f}억")
-        else:
-            total_equity.append("N/A")
-    if any(te != "N/A" for te in total_equity):
-        lines.append(f"  💼 자본총계: {' → '.join(total_equity)}")
-    
-    # 부채비율
-    debt_ratios = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('debt_ratio'):
-            debt_ratios.append(f"{stmt.raw_data['debt_ratio']:.1f}%")
-        else:
-            debt_ratios.append("N/A")
-    if any(dr != "N/A" for dr in debt_ratios):
-        lines.append(f"  ⚖️ 부채비율: {' → '.join(debt_ratios)}")
-    
-    # === 현금흐름표 ===
-    lines.append("\n【현금흐름표】")
-    
-    # 영업활동 현금흐름
-    operating_cfs = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('operating_cash_flow'):
-            cf_val = stmt.raw_data['operating_cash_flow'] / 100000000
-            operating_cfs.append(f"{cf_val:+.0f}억")
-        else:
-            operating_cfs.append("N/A")
-    if any(ocf != "N/A" for ocf in operating_cfs):
-        lines.append(f"  💸 영업활동CF: {' → '.join(operating_cfs)}")
-    
-    # 투자활동 현금흐름
-    investing_cfs = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('investing_cash_flow'):
-            cf_val = stmt.raw_data['investing_cash_flow'] / 100000000
-            investing_cfs.append(f"{cf_val:+.0f}억")
-        else:
-            investing_cfs.append("N/A")
-    if any(icf != "N/A" for icf in investing_cfs):
-        lines.append(f"  🏗️ 투자활동CF: {' → '.join(investing_cfs)}")
-    
-    # 재무활동 현금흐름
-    financing_cfs = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('financing_cash_flow'):
-            cf_val = stmt.raw_data['financing_cash_flow'] / 100000000
-            financing_cfs.append(f"{cf_val:+.0f}억")
-        else:
-            financing_cfs.append("N/A")
-    if any(fcf != "N/A" for fcf in financing_cfs):
-        lines.append(f"  🏛️ 재무활동CF: {' → '.join(financing_cfs)}")
+    values = {key: [] for key in HORIZONTAL_KEYS}
+    for stmt, rd in zip(statements[3::-1], rds[3::-1]):
+        periods.append(f"{stmt.period_end.year}-Q{(stmt.period_end.month + 2) // 3}")
+        for key, bucket in values.items():
+            bucket.append(rd.get(key) or None)  # 0 은 값 없음(N/A)으로 표시
+    
+    # 잉여현금흐름 (FCF) = 영업활동CF + 투자활동CF
+    values['free_cash_flow'] = [
+        ocf + icf if ocf and icf else None
+        for ocf, icf in zip(values['operating_cash_flow'], values['investing_cash_flow'])
+    ]
     
-    # 잉여현금흐름 (FCF)
-    fcfs = []
-    for stmt in reversed(statements[:4]):
-        if (stmt.raw_data and 
-            stmt.raw_data.get('operating_cash_flow') and 
-            stmt.raw_data.get('investing_cash_flow')):
-            fcf = (stmt.raw_data['operating_cash_flow'] + 
-                   stmt.raw_data['investing_cash_flow']) / 100000000
-            fcfs.append(f"{fcf:+.0f}억")
-        else:
-            fcfs.append("N/A")
-    if any(f != "N/A" for f in fcfs):
-        lines.append(f"  💎 잉여현금흐름(FCF): {' → '.join(fcfs)}")
-    
-    # === 수익성 지표 ===
-    lines.append("\n【수익성 지표】")
-    
-    # ROE
-    roes = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('roe'):
-            roes.append(f"{stmt.raw_data['roe']:.1f}%")
-        else:
-            roes.append("N/A")
-    if any(r != "N/A" for r in roes):
-        lines.append(f"  📊 ROE: {' → '.join(roes)}")
-    
-    # ROA
-    roas = []
-    for stmt in reversed(statements[:4]):
-        if stmt.raw_data and stmt.raw_data.get('roa'):
-            roas.append(f"{stmt.raw_data['roa']:.1f}%")
-        else:
-            roas.append("N/A")
-    if any(r != "N/A" for r in roas):
-        lines.append(f"  📈 ROA: {' → '.join(roas)}")
+    # 값이 하나라도 있는 지표만 표시 (전부 N/A 면 보고서 생략)
+    has = {key: any(v is not None for v in row) for key, row in values.items()}
+    if not any(has.values()):
+        return ""
+    
+    lines = [REPORT_HEADER, f"\n기간: {' → '.join(periods)}"]
+    
+    for title, fields in HORIZONTAL_SECTIONS:
+        rows = [field for field in fields if has[field[0]]]
+        if not rows:
+            continue  # 빈 섹션은 제목도 생략
+        lines.append(f"\n【{title}】")
+        for key, icon, label, kind in rows:
+            fmt = VALUE_FORMATS[kind]
+            cells = ' → '.join("N/A" if v is None else fmt(v) for v in values[key])
+            lines.append(f"  {icon} {label}: {cells}")
     
     # === 증감률 분석 ===
-    growth_rates = calculate_growth_rates(statements)
+    growth_rates = _growth_rates(rds)
     
     if growth_rates.get('qoq'):
-        lines.append("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        lines.append("【전분기 대비 (QoQ) 증감률】")
+        lines.append(f"\n{SEPARATOR}\n【전분기 대비 (QoQ) 증감률】")
         qoq = growth_rates['qoq']
-        if 'revenue' in qoq:
-            lines.append(f"  • 매출: {qoq['revenue']:+.1f}%")
-        if 'operating_income' in qoq:
-            lines.append(f"  • 영업이익: {qoq['operating_income']:+.1f}%")
-        if 'net_income' in qoq:
-            lines.append(f"  • 순이익: {qoq['net_income']:+.1f}%")
-        if 'operating_cash_flow' in qoq:
-            lines.append(f"  • 영업CF: {qoq['operating_cash_flow']:+.1f}%")
+        lines.extend(
+            f"  • {METRIC_LABELS[metric]}: {qoq[metric]:+.1f}%"
+            for metric in GROWTH_SUMMARY_METRICS if metric in qoq
+        )
         
         # 비율 차이
-        if 'roe_diff' in qoq:
-            lines.append(f"  • ROE 변화: {qoq['roe_diff']:+.1f}%p")
-        if 'operating_margin_diff' in qoq:
-            lines.append(f"  • 영업이익률 변화: {qoq['operating_margin_diff']:+.1f}%p")
+        lines.extend(
+            f"  • {METRIC_LABELS[metric]} 변화: {qoq[metric + '_diff']:+.1f}%p"
+            for metric in DIFF_SUMMARY_METRICS if metric + '_diff' in qoq
+        )
     
     if growth_rates.get('yoy'):
         lines.append("\n【전년 동기 대비 (YoY) 증감률】")
         yoy = growth_rates['yoy']
-        if 'revenue' in yoy:
-            lines.append(f"  • 매출: {yoy['revenue']:+.1f}%")
-        if 'operating_income' in yoy:
-            lines.append(f"  • 영업이익: {yoy['operating_income']:+.1f}%")
-        if 'net_income' in yoy:
-            lines.append(f"  • 순이익: {yoy['net_income']:+.1f}%")
-        if 'operating_cash_flow' in yoy:
-            lines.append(f"  • 영업CF: {yoy['operating_cash_flow']:+.1f}%")
+        lines.extend(
+            f"  • {METRIC_LABELS[metric]}: {yoy[metric]:+.1f}%"
+            for metric in GROWTH_SUMMARY_METRICS if metric in yoy
+        )
     
     if growth_rates.get('trend'):
         lines.append("\n【4분기 추세 판단】")
-        for metric, trend in growth_rates['trend'].items():
-            metric_name = {
-                'revenue': '매출',
-                'operating_income': '영업이익',
-                'net_income': '순이익',
-                'roe': 'ROE',
-                'operating_margin': '영업이익률',
-                'operating_cash_flow': '영업CF'
-            }.get(metric, metric)
-            lines.append(f"  • {metric_name}: {trend}")
-    
-    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        lines.extend(
+            f"  • {METRIC_LABELS.get(metric, metric)}: {trend}"
+            for metric, trend in growth_rates['trend'].items()
+        )
+    
+    lines.append(SEPARATOR + "\n")
     
     return '\n'.join(lines)
 
 
+def _raw_data(statements: List[Any]) -> List[dict]:
+    """재무제표별 raw_data (없으면 빈 dict)"""
+    return [stmt.raw_data or _NO_DATA for stmt in statements]
+
+
 def calculate_growth_rates(statements: List[Any]) -> Dict[str, Any]:
     """4분기 연속 데이터에서 YoY, QoQ 증감률 계산"""
-    if len(statements) < 2:
+    return _growth_rates(_raw_data(statements[:5]))
+
+
+def _growth_rates(rds: List[dict]) -> Dict[str, Any]:
+    """최신순 raw_data 리스트 (최대 5분기) 로 증감률 계산"""
+    if len(rds) < 2:
         return {}
     
     result = {
@@ -262,83 +183,80 @@ def calculate_growth_rates(statements: List[Any]) -> Dict[str, Any]:
     }
     
     # QoQ 계산
-    if len(statements) >= 2:
-        latest = statements[0]
-        prev = statements[1]
-        result['qoq'] = _calculate_change(latest, prev)
+    result['qoq'] = _calculate_change(rds[0], rds[1])
     
     # YoY 계산
-    if len(statements) >= 5:
-        latest = statements[0]
-        year_ago = statements[4]
-        result['yoy'] = _calculate_change(latest, year_ago)
+    if len(rds) >= 5:
+        result['yoy'] = _calculate_change(rds[0], rds[4])
     
     # 4분기 추세 분석
-    if len(statements) >= 4:
-        result['trend'] = _analyze_trend(statements[:4])
+    if len(rds) >= 4:
+        result['trend'] = _analyze_trend(rds[:4])
     
     return result
 
 
-def _calculate_change(current: Any, previous: Any) -> Dict[str, float]:
-    """두 기간 사이의 증감률 계산"""
+def _to_matrix(rds: List[dict], keys: tuple) -> np.ndarray:
+    """raw_data × keys 실수 행렬 (값 없음 → NaN)"""
+    matrix = np.full((len(rds), len(keys)), np.nan)
+    for i, rd in enumerate(rds):
+        matrix[i] = [np.nan if rd.get(key) is None else rd[key] for key in keys]
+    return matrix
+
+
+def _calculate_change(current: dict, previous: dict) -> Dict[str, float]:
+    """두 기간 raw_data 사이의 증감률 계산"""
     changes = {}
     
-    if not (current.raw_data and previous.raw_data):
+    if not (current and previous):
         return changes
     
-    metrics = [
-        'revenue', 'operating_income', 'net_income',
-        'total_assets', 'total_equity', 'operating_cash_flow',
-        'investing_cash_flow', 'financing_cash_flow'
-    ]
-    
-    for metric in metrics:
-        curr_val = current.raw_data.get(metric)
-        prev_val = previous.raw_data.get(metric)
-        
-        if curr_val and prev_val and prev_val != 0:
-            change_pct = ((curr_val - prev_val) / abs(prev_val)) * 100
-            changes[metric] = round(change_pct, 1)
+    # 금액 지표는 증감률 (0 또는 값 없음은 제외)
+    curr, prev = _to_matrix([current, previous], CHANGE_METRICS)
+    valid = (np.nan_to_num(curr) != 0) & (np.nan_to_num(prev) != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = (curr - prev) / np.abs(prev) * 100
+    changes.update(
+        (metric, round(float(value), 1))
+        for metric, value, ok in zip(CHANGE_METRICS, pct, valid) if ok
+    )
     
     # 비율 지표는 차이
-    ratio_metrics = ['roe', 'roa', 'operating_margin', 'net_margin', 'debt_ratio']
-    
-    for metric in ratio_metrics:
-        curr_val = current.raw_data.get(metric)
-        prev_val = previous.raw_data.get(metric)
-        
-        if curr_val is not None and prev_val is not None:
-            diff = curr_val - prev_val
-            changes[metric + '_diff'] = round(diff, 1)
+    curr, prev = _to_matrix([current, previous], RATIO_METRICS)
+    diff = curr - prev
+    changes.update(
+        (metric + '_diff', round(float(value), 1))
+        for metric, value in zip(RATIO_METRICS, diff) if not np.isnan(value)
+    )
     
     return changes
 
 
-def _analyze_trend(statements: List[Any]) -> Dict[str, str]:
-    """4분기 추세 분석"""
-    trends = {}
-    
-    metrics = ['revenue', 'operating_income', 'net_income', 'roe', 'operating_margin', 'operating_cash_flow']
-    
-    for metric in metrics:
-        values = []
-        for stmt in statements:
-            if stmt.raw_data and stmt.raw_data.get(metric) is not None:
-                values.append(stmt.raw_data[metric])
-        
-        if len(values) >= 3:
-            increasing = sum(1 for i in range(len(values)-1) if values[i] > values[i+1])
-            decreasing = sum(1 for i in range(len(values)-1) if values[i] < values[i+1])
-            
-            if increasing >= 2:
-                trends[metric] = "📈 상승 추세"
-            elif decreasing >= 2:
-                trends[metric] = "📉 하락 추세"
-            else:
-                trends[metric] = "➡️ 횡보"
-    
-    return trends
+def _analyze_trend(rds: List[dict]) -> Dict[str, str]:
+    """4분기 추세 분석 (최신순 raw_data)"""
+    matrix = _to_matrix(rds, TREND_METRICS)
+    present = ~np.isnan(matrix)
+    
+    # 빈 분기는 직전 값으로 채워 비교 (중복 값끼리는 증가/감소 어느 쪽도 아님)
+    idx = np.where(present, np.arange(len(matrix))[:, None], 0)
+    filled = matrix[np.maximum.accumulate(idx, axis=0), np.arange(matrix.shape[1])]
+    
+    # 최신순이므로 앞 분기 값이 더 크면 상승
+    with np.errstate(invalid='ignore'):
+        increasing = (filled[:-1] > filled[1:]).sum(axis=0)
+        decreasing = (filled[:-1] < filled[1:]).sum(axis=0)
+    
+    trend = np.select(
+        [increasing >= 2, decreasing >= 2],
+        ["📈 상승 추세", "📉 하락 추세"],
+        default="➡️ 횡보",
+    )
+    
+    return {
+        metric: str(label)
+        for metric, label, count in zip(TREND_METRICS, trend, present.sum(axis=0))
+        if count >= 3
+    }
 
 
 def calculate_additional_metrics(statement: Any) -> Dict[str, Any]:
@@ -1,13 +1,37 @@
 """유틸리티 함수"""
 import os
-import yaml
+import copy
+import json
+import time
+import hashlib
 import logging
-from typing import Dict, Any, List
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Iterator, List
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+WIKI_CACHE_TTL = 24 * 3600  # Wikipedia 종목 리스트 캐시 유효시간 (초)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    import yaml  # setup_logger / chunk_list 만 쓰는 모듈은 yaml 로드 생략
+    
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml C 확장 우선
+    with open(config_path, "rb") as f:
+        data = f.read()  # 한 번에 읽은 바이트를 그대로 전달 (UTF-8 디코딩도 파서가 처리)
+    return yaml.load(data, Loader=loader)
 
 
 def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    """설정 로드 (경로+수정시각+크기 기준 캐시 - 파일이 바뀌면 다시 파싱)"""
+    st = os.stat(config_path)
+    config = _load_config_cached(config_path, st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(config)  # 호출 측 수정이 캐시에 남지 않도록 복사본 반환
+
+
+load_config.cache_clear = _load_config_cached.cache_clear
 
 
 def setup_logger(name: str = "marketsense", level: str = "INFO", log_file: str = None) -> logging.Logger:
@@ -31,24 +55,117 @@ def setup_logger(name: str = "marketsense", level: str = "INFO", log_file: str =
     return logger
 
 
+def write_pid_file(pid_path: str) -> None:
+    """현재 프로세스 PID 기록 (종료 시 자동 삭제)"""
+    import atexit
+
+    os.makedirs(os.path.dirname(pid_path) or ".", exist_ok=True)
+    with open(pid_path, "w") as f:
+        f.write(str(os.getpid()))
+
+    def _remove():
+        try:
+            with open(pid_path) as f:
+                if f.read().strip() == str(os.getpid()):
+                    os.remove(pid_path)
+        except OSError:
+            pass
+
+    atexit.register(_remove)
+
+
+def is_pid_file_alive(pid_path: str) -> bool:
+    """PID 파일의 프로세스가 살아있는지 확인 (fork 없이 signal 0)"""
+    try:
+        with open(pid_path) as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True  # 프로세스는 존재하지만 다른 사용자 소유
+    except (OSError, ValueError):
+        return False
+
+
+def is_process_running(pattern: str) -> bool:
+    """cmdline 에 pattern 이 포함된 프로세스가 있는지 확인
+
+    Linux 는 /proc 의 cmdline 을 직접 읽고 (fork 없음), /proc 이 없는 macOS 등에서는
+    `pgrep -f` 를 한 번 실행한다.
+    """
+    own_pid = str(os.getpid())
+    try:
+        pids = [p for p in os.listdir("/proc") if p.isdigit() and p != own_pid]
+    except OSError:
+        return _pgrep(pattern)
+
+    needle = pattern.encode()
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                # 인자는 NUL 로 구분되어 있으므로 pgrep -f 처럼 공백으로 이어서 비교
+                if needle in f.read().replace(b"\0", b" "):
+                    return True
+        except OSError:
+            continue  # 조회 중 종료된 프로세스
+    return False
+
+
+def _pgrep(pattern: str) -> bool:
+    """`pgrep -f pattern` 으로 확인 (/proc 스캔과 같이 자기 자신은 제외)"""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["pgrep", "-f", pattern], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    own_pid = str(os.getpid())
+    return any(pid != own_pid for pid in result.stdout.split())
+
+
+def _wiki_tickers(url: str, table_index: int) -> tuple:
+    """Wikipedia 표의 Symbol 컬럼 (파일 캐시, TTL 24시간 - 매 호출마다 유효시간 확인)"""
+    cache_file = CACHE_DIR / f"wiki_{hashlib.md5(url.encode()).hexdigest()}.json"
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if time.time() - data["fetched_at"] < WIKI_CACHE_TTL:
+            return tuple(data["tickers"])
+    except (OSError, ValueError, KeyError):
+        pass  # 캐시 없음/손상 → 새로 조회
+
+    import pandas as pd
+    df = pd.read_html(url)[table_index]
+    tickers = df["Symbol"].str.replace(".", "-", regex=False).tolist()
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "tickers": tickers}, f)
+    except OSError as e:
+        logging.getLogger("marketsense").debug(f"티커 캐시 저장 실패: {e}")
+    return tuple(tickers)
+
+
 def get_sp500_tickers() -> List[str]:
     """S&P 500 종목 리스트 가져오기 (Wikipedia)"""
-    import pandas as pd
-    url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-    tables = pd.read_html(url)
-    df = tables[0]
-    return df["Symbol"].str.replace(".", "-", regex=False).tolist()
+    return list(_wiki_tickers("https://en.wikipedia.org/wiki/List_of_S%26P_500_companies", 0))
 
 
 def get_sp100_tickers() -> List[str]:
     """S&P 100 종목 리스트 가져오기"""
-    import pandas as pd
-    url = "https://en.wikipedia.org/wiki/S%26P_100"
-    tables = pd.read_html(url)
-    df = tables[2]  # S&P 100 테이블
-    return df["Symbol"].str.replace(".", "-", regex=False).tolist()
+    return list(_wiki_tickers("https://en.wikipedia.org/wiki/S%26P_100", 2))  # S&P 100 테이블
+
+
+def ichunks(iterable, size: int) -> Iterator[list]:
+    """iterable을 size 단위 리스트로 차례대로 생성 (한 번만 순회하는 호출 측용)"""
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
 
 
 def chunk_list(lst: list, chunk_size: int) -> list:
     """리스트를 chunk_size 단위로 분할"""
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+    return list(ichunks(lst, chunk_size))
@@ -9,14 +9,32 @@ References:
 import os
 import json
 import logging
+import threading
+import time
 import requests
-import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, List
 
+try:
+    import fcntl  # POSIX 전용 - 없으면 프로세스 간 토큰 발급 잠금 생략
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson  # 선택 - 없으면 표준 json 으로 응답 파싱
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("marketsense")
 
+# 응답 본문(bytes) JSON 파싱 (일별 시세 등 큰 응답에서 orjson 이 수 배 빠름)
+_json_loads = orjson.loads if orjson else json.loads
+
 
 class KISApi:
     """한국투자증권 OpenAPI 클라이언트"""
@@ -26,6 +44,12 @@ class KISApi:
     # 모의투자
     MOCK_URL = "https://openapivts.koreainvestment.com:29443"
     
+    # 초당 요청 제한 (fetch_many 동시 조회 시 적용)
+    MAX_REQUESTS_PER_SEC = 20
+    
+    # 토큰 캐시 유효시간 (초) - 발급 토큰은 24시간 유효, 여유를 두고 23시간
+    TOKEN_TTL = 23 * 3600
+    
     def __init__(self, app_key: str = None, app_secret: str = None, mock: bool = False):
         """
         Args:
@@ -44,6 +68,26 @@ class KISApi:
         self.access_token = None
         self.token_file = Path(__file__).parent.parent.parent / "cache" / "kis_token.json"
         
+        # 연결 재사용 (요청마다 TCP/TLS 핸드셰이크 방지) + 일시 오류 재시도
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ))
+    
+        self._token_lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+    
+    def close(self):
+        """HTTP 세션 종료"""
+        self.session.close()
+    
     def _load_cached_token(self) -> Optional[str]:
         """캐시된 토큰 로드"""
         if not self.token_file.exists():
@@ -53,9 +97,8 @@ class KISApi:
             with open(self.token_file, 'r') as f:
                 data = json.load(f)
             
-            # 만료 시간 확인 (24시간)
-            expires_at = datetime.fromisoformat(data.get('expires_at'))
-            if datetime.now() < expires_at:
+            # 만료 시간 확인 (epoch 초, 이전 형식 캐시는 만료로 처리)
+            if time.time() < data.get('expires_at_epoch', 0):
                 logger.info("[KIS] 캐시된 토큰 사용")
                 return data.get('access_token')
             else:
@@ -73,21 +116,58 @@ class KISApi:
             
             data = {
                 'access_token': token,
-                'expires_at': (datetime.now() + timedelta(hours=23)).isoformat()
+                'expires_at_epoch': int(time.time()) + self.TOKEN_TTL,
             }
             
-            with open(self.token_file, 'w') as f:
-                json.dump(data, f)
+            # 임시 파일에 쓴 뒤 교체 (동시에 읽는 프로세스가 잘린 파일을 보지 않도록)
+            tmp_file = self.token_file.with_name(f"{self.token_file.name}.tmp.{os.getpid()}")
+            try:
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.token_file)
+            finally:
+                tmp_file.unlink(missing_ok=True)
                 
         except Exception as e:
             logger.debug(f"[KIS] 토큰 캐시 저장 실패: {e}")
+    
+    @contextmanager
+    def _token_file_lock(self):
+        """토큰 캐시 확인~발급~저장을 프로세스 간 직렬화
+        
+        봇·모니터 등 여러 프로세스가 동시에 시작해도 토큰은 한 번만 발급되고
+        나머지는 잠금 해제 후 캐시 파일의 토큰을 사용한다.
+        """
+        lock = None
+        if fcntl is not None:
+            try:
+                self.token_file.parent.mkdir(parents=True, exist_ok=True)
+                lock = open(self.token_file.with_name(f"{self.token_file.name}.lock"), 'a')
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            except OSError as e:
+                logger.debug(f"[KIS] 토큰 파일 잠금 실패: {e}")
+        try:
+            yield
+        finally:
+            if lock is not None:
+                lock.close()  # 닫으면 잠금 해제
         
     def _get_access_token(self) -> str:
-        """접근 토큰 발급 (캐싱)"""
+        """접근 토큰 발급 (캐싱, 스레드 간 1회만 발급)"""
         # 메모리 캐시 확인
         if self.access_token:
             return self.access_token
         
+        with self._token_lock:
+            if self.access_token:  # 대기 중 다른 스레드가 발급 완료
+                return self.access_token
+            with self._token_file_lock():
+                return self._issue_access_token()
+    
+    def _issue_access_token(self) -> str:
+        """파일 캐시 확인 후 없으면 새로 발급"""
         # 파일 캐시 확인
         cached_token = self._load_cached_token()
         if cached_token:
@@ -104,10 +184,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=10)
+            resp = self.session.post(url, headers=headers, json=data, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 self.access_token = result.get("access_token")
                 
                 # 캐시 저장
@@ -123,6 +203,40 @@ class KISApi:
             logger.error(f"[KIS] 토큰 발급 오류: {e}")
             return None
     
+    def _throttle(self):
+        """MAX_REQUESTS_PER_SEC 이내로 요청 간격 조절 (스레드 공유)"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1 / self.MAX_REQUESTS_PER_SEC
+        if wait > 0:
+            time.sleep(wait)
+    
+    def fetch_many(self, func, tickers: List[str], *args, max_workers: int = 8) -> Dict[str, object]:
+        """여러 종목을 스레드 풀로 동시 조회
+        
+        Args:
+            func: 종목코드를 첫 인자로 받는 조회 함수 (예: self.get_investor_trading)
+            tickers: 종목코드 리스트
+            *args: func 에 전달할 추가 인자
+            max_workers: 동시 요청 수
+        
+        Returns:
+            {ticker: func 결과}
+        """
+        if not tickers:
+            return {}
+        
+        # 토큰은 미리 한 번만 확보 (스레드별 중복 발급 방지)
+        self._get_access_token()
+        
+        def call(ticker):
+            self._throttle()
+            return func(ticker, *args)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(call, tickers)))
+    
     def _get_headers(self, tr_id: str) -> Dict:
         """API 요청 헤더"""
         token = self._get_access_token()
@@ -154,10 +268,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     return result.get("output")
@@ -203,10 +317,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     return result.get("output", [])
@@ -248,10 +362,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     return result.get("output2", [])
@@ -295,10 +409,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     return result.get("output", [])
@@ -344,10 +458,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     return result.get("output2", [])
@@ -394,10 +508,10 @@ class KISApi:
         }
         
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=5)
+            resp = self.session.get(url, headers=headers, params=params, timeout=5)
             
             if resp.status_code == 200:
-                result = resp.json()
+                result = _json_loads(resp.content)
                 
                 if result.get("rt_cd") == "0":
                     output = result.get("output")
@@ -426,11 +540,26 @@ class KISApi:
             return None
 
 
+_kis_api = None
+
+
+def get_kis_api() -> KISApi:
+    """싱글톤 인스턴스 반환 (프로세스 내 토큰·HTTP 연결 공유)
+
+    Raises:
+        ValueError: KIS_APP_KEY / KIS_APP_SECRET 미설정
+    """
+    global _kis_api
+    if _kis_api is None:
+        _kis_api = KISApi()
+    return _kis_api
+
+
 # 편의 함수
 def get_kis_investor_trading(ticker: str, date: str) -> Optional[List[Dict]]:
     """투자자별 매매동향 조회 (편의 함수)"""
     try:
-        api = KISApi()
+        api = get_kis_api()
         return api.get_investor_trading(ticker, date)
     except ValueError as e:
         logger.error(f"[KIS] API 초기화 실패: {e}")
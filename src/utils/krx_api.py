@@ -6,16 +6,46 @@ OTP 생성 → 데이터 다운로드 방식으로
 References:
 - http://data.krx.co.kr/
 """
+import codecs
 import io
 import logging
+import threading
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from typing import Optional
 
+try:
+    import pyarrow as pa  # 선택 - 없으면 pandas 로 CSV 파싱
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
 logger = logging.getLogger("marketsense")
 
 
+ARROW_MIN_BYTES = 64 * 1024  # 이보다 작은 응답은 pandas C 파서가 더 빠름 (pyarrow 초기화 비용)
+
+
+def _parse_csv(content: bytes) -> pd.DataFrame:
+    """KRX CSV (EUC-KR) 파싱 - 큰 응답은 pyarrow 멀티스레드 C++ 파서 사용
+    
+    두 경로 모두 EUC-KR 을 읽으면서 스트리밍 디코딩한다 (UTF-8 사본 전체를 만들지 않음).
+    """
+    if pa is None or len(content) < ARROW_MIN_BYTES:
+        text_stream = codecs.getreader('euc-kr')(io.BytesIO(content))
+        return pd.read_csv(text_stream, engine='c', low_memory=False)
+    
+    table = pacsv.read_csv(
+        pa.BufferReader(content),
+        read_options=pacsv.ReadOptions(block_size=1 << 20, encoding='euc-kr'),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True),  # 빈 칸 → NaN (pandas 와 동일)
+    )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
 class KRXDataAPI:
     """KRX 정보데이터시스템 API"""
     
@@ -30,6 +60,21 @@ class KRXDataAPI:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        # 연결 재사용 (keep-alive) + 일시 오류 재시도
+        # OTP 생성·CSV 다운로드 모두 POST 라 POST 도 재시도 대상에 포함 (조회성 요청)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=frozenset({"GET", "POST"}),
+                raise_on_status=False,  # 재시도 후에도 실패하면 응답 코드로 처리
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         # 세션 초기화 (메인 페이지 방문)
         self._init_session()
     
@@ -68,8 +113,7 @@ class KRXDataAPI:
                 return None
             
             # CSV 파싱 (EUC-KR 인코딩)
-            df = pd.read_csv(io.BytesIO(resp.content), encoding='EUC-KR')
-            return df
+            return _parse_csv(resp.content)
             
         except Exception as e:
             logger.error(f"[KRX] CSV 다운로드 오류: {e}")
@@ -168,20 +212,31 @@ class KRXDataAPI:
         return self._download_csv(otp)
 
 
+_krx_api = None
+_krx_api_lock = threading.Lock()
+
+
+def get_krx_api() -> KRXDataAPI:
+    """싱글톤 인스턴스 반환 (세션 쿠키·HTTP 연결 재사용, 메인 페이지 방문 1회)"""
+    global _krx_api
+    if _krx_api is None:
+        with _krx_api_lock:
+            if _krx_api is None:
+                _krx_api = KRXDataAPI()
+    return _krx_api
+
+
 # 편의 함수
 def get_krx_shorting_balance(date: str, market: str = "ALL") -> Optional[pd.DataFrame]:
     """공매도 잔고 조회 (편의 함수)"""
-    api = KRXDataAPI()
-    return api.get_shorting_balance(date, market)
+    return get_krx_api().get_shorting_balance(date, market)
 
 
 def get_krx_shorting_volume(date: str, market: str = "ALL") -> Optional[pd.DataFrame]:
     """공매도 거래량 조회 (편의 함수)"""
-    api = KRXDataAPI()
-    return api.get_shorting_volume(date, market)
+    return get_krx_api().get_shorting_volume(date, market)
 
 
 def get_krx_margin_trading(date: str, market: str = "ALL") -> Optional[pd.DataFrame]:
     """신용거래 조회 (편의 함수)"""
-    api = KRXDataAPI()
-    return api.get_margin_trading(date, market)
+    return get_krx_api().get_margin_trading(date, market)
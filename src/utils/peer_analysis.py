@@ -2,14 +2,53 @@
 
 Peer Comparison for Valuation Analysis
 """
+import copy
 import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, select
 
-from src.storage.models import Stock, FinancialStatement, PriceData
+from src.storage.models import Stock, FinancialStatement, PriceData, SectorMetrics
 
 logger = logging.getLogger("marketsense")
 
+PEER_CACHE_TTL = 300  # 동종업계 비교 결과 캐시 유효시간 (초)
+PEER_CACHE_SIZE = 2048
+PEER_LIMIT = 10  # 비교 대상 동종업계 종목 수 (시총 상위)
+SECTOR_METRICS_TTL = 3600  # sector_metrics 행 유효시간 (초) - 지나면 실시간 계산
+
+# 평균에 포함할 지표별 허용 구간 (low < 값 < high, 이상치 제거)
+RATIO_BOUNDS = {
+    'pe': (0, 100),
+    'pb': (0, 10),
+    'debt_ratio': (0, 500),
+    'roe': (-50, 100),
+}
+
+_peer_cache = {}  # {ticker: (compare_with_peers 결과, 저장 시각)}
+
+
+@dataclass(slots=True)
+class PeerMetrics:
+    """동종업계 평균 지표 (이상치 제거 평균, 값이 없으면 None)"""
+    count: int = 0
+    avg_market_cap: float = 0.0
+    avg_pe: Optional[float] = None
+    avg_pb: Optional[float] = None
+    avg_debt_ratio: Optional[float] = None
+    avg_roe: Optional[float] = None
+
+
+def clear_peer_cache():
+    """동종업계 비교 캐시 비우기 (재무제표·주가 수집 후 호출)
+    
+    한 종목의 데이터가 바뀌면 같은 업종 모든 종목의 비교 결과가 달라지므로
+    종목별이 아닌 전체를 비운다.
+    """
+    _peer_cache.clear()
+
 
 def get_peer_stocks(session, ticker: str, limit: int = 10) -> List[Stock]:
     """동종업계 종목 조회
@@ -40,7 +79,65 @@ def get_peer_stocks(session, ticker: str, limit: int = 10) -> List[Stock]:
     return peers
 
 
-def calculate_peer_metrics(session, peers: List[Stock]) -> Dict:
+def _ranked_latest(model, order_column, stock_ids: List[int]):
+    """종목별 최신순 순번(rn) 서브쿼리 - rn == 1 이 종목별 최신 행
+    
+    ROW_NUMBER() OVER (PARTITION BY stock_id ORDER BY order_column DESC) 로
+    여러 종목의 최신 행을 한 번에 고른다 (종목마다 ORDER BY ... LIMIT 1 반복 방지).
+    """
+    return select(
+        model,
+        func.row_number().over(
+            partition_by=model.stock_id,
+            order_by=order_column.desc(),
+        ).label('rn'),
+    ).where(model.stock_id.in_(stock_ids)).subquery()
+
+
+def _avg_between(value, low: float, high: float):
+    """low < value < high 인 값만 평균 (이상치 제거, 없으면 NULL)"""
+    return func.avg(case((and_(value > low, value < high), value)))
+
+
+def _peer_ratios(stock_ids: List[int]):
+    """종목별 최신 재무제표·주가로 계산한 지표 (stock_id, pe, pb, debt_ratio, roe) SELECT
+    
+    재무제표가 없는 종목은 빠진다. 0 으로 나누지 않도록 CASE 안에서만 나눗셈 (조건 불충족 → NULL).
+    """
+    fs = _ranked_latest(FinancialStatement, FinancialStatement.period_end, stock_ids)
+    px = _ranked_latest(PriceData, PriceData.date, stock_ids)
+    
+    pe = case((and_(px.c.close.isnot(None), fs.c.eps > 0), px.c.close / fs.c.eps))
+    bps = case((
+        and_(fs.c.total_equity != 0, Stock.market_cap != 0),
+        fs.c.total_equity / Stock.market_cap,
+    ))
+    pb = case((and_(px.c.close.isnot(None), bps > 0), px.c.close / bps))
+    debt_ratio = case((
+        and_(fs.c.total_liabilities != 0, fs.c.total_equity > 0),
+        fs.c.total_liabilities / fs.c.total_equity * 100,
+    ))
+    roe = case((
+        and_(fs.c.net_income != 0, fs.c.total_equity > 0),
+        fs.c.net_income / fs.c.total_equity * 100,
+    ))
+    
+    return (
+        select(
+            Stock.id.label('stock_id'),
+            pe.label('pe'),
+            pb.label('pb'),
+            debt_ratio.label('debt_ratio'),
+            roe.label('roe'),
+        )
+        .select_from(Stock)
+        .join(fs, and_(fs.c.stock_id == Stock.id, fs.c.rn == 1))
+        .outerjoin(px, and_(px.c.stock_id == Stock.id, px.c.rn == 1))
+        .where(Stock.id.in_(stock_ids))
+    )
+
+
+def calculate_peer_metrics(session, peers: List[Stock]) -> Optional[PeerMetrics]:
     """동종업계 평균 지표 계산
     
     Args:
@@ -48,30 +145,17 @@ def calculate_peer_metrics(session, peers: List[Stock]) -> Dict:
         peers: 동종업계 종목 리스트
         
     Returns:
-        {'avg_pe': float, 'avg_pb': float, ...}
+        PeerMetrics (peers 가 없으면 None)
     """
     if not peers:
-        return {}
+        return None
     
-    metrics = {
-        'count': len(peers),
-        'avg_market_cap': 0,
-        'avg_pe': None,
-        'avg_pb': None,
-        'avg_debt_ratio': None,
-        'avg_roe': None,
-    }
+    metrics = PeerMetrics(count=len(peers))
     
     # 시총 평균
     market_caps = [p.market_cap for p in peers if p.market_cap]
     if market_caps:
-        metrics['avg_market_cap'] = sum(market_caps) / len(market_caps)
-    
-    # 재무 지표 평균 (최근 데이터 사용)
-    pe_ratios = []
-    pb_ratios = []
-    debt_ratios = []
-    roes = []
+        metrics.avg_market_cap = sum(market_caps) / len(market_caps)
     
     # 네이버 PER 평균 (raw_data 필드 추가 필요 - 임시로 스킵)
     # naver_pers = []
@@ -88,72 +172,121 @@ def calculate_peer_metrics(session, peers: List[Stock]) -> Dict:
     # 
     # # 네이버 PER 평균 계산
     # if naver_pers:
-    #     metrics['avg_pe'] = sum(naver_pers) / len(naver_pers)
-    #     metrics['naver_pe_count'] = len(naver_pers)
+    #     metrics.avg_pe = sum(naver_pers) / len(naver_pers)
     # 
     # if naver_pbrs:
-    #     metrics['avg_pb'] = sum(naver_pbrs) / len(naver_pbrs)
-    #     metrics['naver_pbr_count'] = len(naver_pbrs)
+    #     metrics.avg_pb = sum(naver_pbrs) / len(naver_pbrs)
     
-    for peer in peers:
-        # 최근 재무제표
-        stmt = session.query(FinancialStatement).filter(
-            FinancialStatement.stock_id == peer.id
-        ).order_by(
-            FinancialStatement.period_end.desc()
-        ).first()
-        
-        if not stmt:
-            continue
-        
-        # 최근 주가
-        price_data = session.query(PriceData).filter(
-            PriceData.stock_id == peer.id
+    # 재무 지표 평균 (최근 데이터 사용)
+    # 종목별 지표 위에서 이상치 제거·평균까지 SQL 로 계산해 집계 결과 한 행만 받는다
+    ratios = _peer_ratios([p.id for p in peers]).subquery()
+    row = session.execute(select(*(
+        _avg_between(ratios.c[name], low, high).label(f'avg_{name}')
+        for name, (low, high) in RATIO_BOUNDS.items()
+    ))).one()
+    
+    metrics.avg_pe = row.avg_pe
+    metrics.avg_pb = row.avg_pb
+    metrics.avg_debt_ratio = row.avg_debt_ratio
+    metrics.avg_roe = row.avg_roe
+    
+    return metrics
+
+
+def refresh_sector_metrics(session) -> int:
+    """업종별 시총 상위 종목 지표를 sector_metrics 테이블에 미리 계산 (정기 실행용)
+    
+    업종마다 시총 상위 PEER_LIMIT + 1 종목의 종목별 지표를 저장한다. 조회 시 대상 종목을
+    빼고 PEER_LIMIT 개로 평균하므로 실시간 계산(get_peer_stocks)과 결과가 같다.
+    
+    Returns:
+        갱신한 업종 수
+    """
+    sectors = session.scalars(
+        select(Stock.sector).where(
+            Stock.sector.isnot(None),
+            Stock.sector != '기타',
+            Stock.market_cap.isnot(None),
+        ).distinct()
+    ).all()
+    
+    for sector in sectors:
+        stocks = session.query(Stock).filter(
+            Stock.sector == sector,
+            Stock.market_cap.isnot(None)
         ).order_by(
-            PriceData.date.desc()
-        ).first()
+            Stock.market_cap.desc()
+        ).limit(PEER_LIMIT + 1).all()
         
-        if price_data and stmt.eps and stmt.eps > 0:
-            pe = price_data.close / stmt.eps
-            if 0 < pe < 100:  # 이상치 제거
-                pe_ratios.append(pe)
-        
-        if price_data and stmt.total_equity and peer.market_cap:
-            # P/B 계산
-            bps = stmt.total_equity / peer.market_cap if peer.market_cap else 0
-            if bps > 0:
-                pb = price_data.close / bps
-                if 0 < pb < 10:
-                    pb_ratios.append(pb)
-        
-        if stmt.total_liabilities and stmt.total_equity and stmt.total_equity > 0:
-            debt_ratio = (stmt.total_liabilities / stmt.total_equity) * 100
-            if 0 < debt_ratio < 500:
-                debt_ratios.append(debt_ratio)
+        ratios = {
+            r.stock_id: r
+            for r in session.execute(_peer_ratios([s.id for s in stocks]))
+        }
+        peers = []
+        for stock in stocks:
+            entry = {'ticker': stock.ticker, 'name': stock.name, 'market_cap': stock.market_cap}
+            ratio = ratios.get(stock.id)
+            for name in RATIO_BOUNDS:
+                entry[name] = getattr(ratio, name) if ratio else None
+            peers.append(entry)
         
-        if stmt.net_income and stmt.total_equity and stmt.total_equity > 0:
-            roe = (stmt.net_income / stmt.total_equity) * 100
-            if -50 < roe < 100:
-                roes.append(roe)
+        row = session.get(SectorMetrics, sector) or SectorMetrics(sector=sector)
+        row.peers = peers
+        row.updated_at = datetime.utcnow()  # 값이 그대로여도 갱신 시각은 기록
+        session.add(row)
     
-    # 평균 계산
-    if pe_ratios:
-        metrics['avg_pe'] = sum(pe_ratios) / len(pe_ratios)
+    session.flush()
+    logger.info(f"업종 평균 지표 갱신: {len(sectors)}개 업종")
+    return len(sectors)
+
+
+def _mean_between(values, low: float, high: float) -> Optional[float]:
+    """low < 값 < high 인 값만 평균 (_avg_between 의 Python 판, 없으면 None)"""
+    kept = [v for v in values if v is not None and low < v < high]
+    return sum(kept) / len(kept) if kept else None
+
+
+def get_sector_peers(session, sector: str, ticker: str):
+    """미리 계산된 업종 행으로 동종업계 종목·평균 지표 구성 (대상 종목 제외)
     
-    if pb_ratios:
-        metrics['avg_pb'] = sum(pb_ratios) / len(pb_ratios)
+    Returns:
+        (peers, PeerMetrics | None) - 행이 없거나 SECTOR_METRICS_TTL 이 지났으면 None
+        peers 는 compare_with_peers 의 'peers' 형식 ({'ticker', 'name', 'market_cap'})
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=SECTOR_METRICS_TTL)
+    row = session.scalars(
+        select(SectorMetrics).where(
+            SectorMetrics.sector == sector,
+            SectorMetrics.updated_at >= cutoff,
+        )
+    ).first()
     
-    if debt_ratios:
-        metrics['avg_debt_ratio'] = sum(debt_ratios) / len(debt_ratios)
+    if not row:
+        return None
     
-    if roes:
-        metrics['avg_roe'] = sum(roes) / len(roes)
+    entries = [e for e in row.peers if e['ticker'] != ticker][:PEER_LIMIT]
+    peers = [
+        {'ticker': e['ticker'], 'name': e['name'], 'market_cap': e['market_cap']}
+        for e in entries
+    ]
+    if not entries:
+        return peers, None
     
-    return metrics
+    metrics = PeerMetrics(count=len(entries))
+    market_caps = [e['market_cap'] for e in entries if e['market_cap']]
+    if market_caps:
+        metrics.avg_market_cap = sum(market_caps) / len(market_caps)
+    metrics.avg_pe = _mean_between([e['pe'] for e in entries], *RATIO_BOUNDS['pe'])
+    metrics.avg_pb = _mean_between([e['pb'] for e in entries], *RATIO_BOUNDS['pb'])
+    metrics.avg_debt_ratio = _mean_between(
+        [e['debt_ratio'] for e in entries], *RATIO_BOUNDS['debt_ratio']
+    )
+    metrics.avg_roe = _mean_between([e['roe'] for e in entries], *RATIO_BOUNDS['roe'])
+    return peers, metrics
 
 
 def compare_with_peers(session, ticker: str) -> Dict:
-    """동종업계 대비 밸류에이션 비교
+    """동종업계 대비 밸류에이션 비교 (결과는 ticker 별로 PEER_CACHE_TTL 동안 캐시)
     
     Args:
         session: DB 세션
@@ -163,7 +296,7 @@ def compare_with_peers(session, ticker: str) -> Dict:
         {
             'sector': str,
             'peers': [...],
-            'peer_metrics': {...},
+            'peer_metrics': PeerMetrics | None,
             'comparison': {
                 'pe_vs_sector': str,  # '저평가' / '적정' / '고평가'
                 'pb_vs_sector': str,
@@ -171,26 +304,46 @@ def compare_with_peers(session, ticker: str) -> Dict:
             }
         }
     """
+    cached = _peer_cache.get(ticker)
+    if cached and time.monotonic() - cached[1] < PEER_CACHE_TTL:
+        return copy.deepcopy(cached[0])
+    
+    result = _compare_with_peers(session, ticker)
+    
+    if len(_peer_cache) >= PEER_CACHE_SIZE:
+        _peer_cache.clear()
+    _peer_cache[ticker] = (result, time.monotonic())
+    return copy.deepcopy(result)
+
+
+def _compare_with_peers(session, ticker: str) -> Dict:
+    """compare_with_peers 본체 (캐시 없이 DB 조회)"""
     # 대상 종목
     target = session.query(Stock).filter(Stock.ticker == ticker).first()
     
     if not target:
         return {}
     
-    # 동종업계 종목
-    peers = get_peer_stocks(session, ticker, limit=10)
+    # 동종업계 종목·평균 지표 (미리 계산된 업종 행 우선, 없거나 오래되면 실시간 계산)
+    sector_peers = get_sector_peers(session, target.sector, ticker) if target.sector else None
+    if sector_peers is not None:
+        peers, peer_metrics = sector_peers
+    else:
+        peer_stocks = get_peer_stocks(session, ticker, limit=PEER_LIMIT)
+        peers = [
+            {'ticker': p.ticker, 'name': p.name, 'market_cap': p.market_cap}
+            for p in peer_stocks
+        ]
+        peer_metrics = calculate_peer_metrics(session, peer_stocks)
     
     if not peers:
         return {
             'sector': target.sector or '미분류',
             'peers': [],
-            'peer_metrics': {},
+            'peer_metrics': None,
             'comparison': {}
         }
     
-    # 동종업계 평균 지표
-    peer_metrics = calculate_peer_metrics(session, peers)
-    
     # 대상 종목 지표
     target_stmt = session.query(FinancialStatement).filter(
         FinancialStatement.stock_id == target.id
@@ -208,9 +361,9 @@ def compare_with_peers(session, ticker: str) -> Dict:
     
     if target_stmt and target_price and peer_metrics:
         # P/E 비교
-        if target_stmt.eps and target_stmt.eps > 0 and peer_metrics.get('avg_pe'):
+        if target_stmt.eps and target_stmt.eps > 0 and peer_metrics.avg_pe:
             target_pe = target_price.close / target_stmt.eps
-            avg_pe = peer_metrics['avg_pe']
+            avg_pe = peer_metrics.avg_pe
             
             if target_pe < avg_pe * 0.8:
                 comparison['pe_vs_sector'] = '저평가'
@@ -224,9 +377,9 @@ def compare_with_peers(session, ticker: str) -> Dict:
         
         # 부채비율 비교
         if (target_stmt.total_liabilities and target_stmt.total_equity and 
-            target_stmt.total_equity > 0 and peer_metrics.get('avg_debt_ratio')):
+            target_stmt.total_equity > 0 and peer_metrics.avg_debt_ratio):
             target_debt = (target_stmt.total_liabilities / target_stmt.total_equity) * 100
-            avg_debt = peer_metrics['avg_debt_ratio']
+            avg_debt = peer_metrics.avg_debt_ratio
             
             if target_debt < avg_debt * 0.8:
                 comparison['debt_vs_sector'] = '우수'
@@ -240,7 +393,7 @@ def compare_with_peers(session, ticker: str) -> Dict:
     
     return {
         'sector': target.sector or '미분류',
-        'peers': [{'ticker': p.ticker, 'name': p.name, 'market_cap': p.market_cap} for p in peers],
+        'peers': peers,
         'peer_metrics': peer_metrics,
         'comparison': comparison
     }
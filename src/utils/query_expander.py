@@ -5,7 +5,8 @@
 import os
 import json
 import logging
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, TypedDict
 
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -15,6 +16,32 @@ load_dotenv()
 
 logger = logging.getLogger("marketsense")
 
+EXPAND_BATCH_SIZE = 20  # LLM 한 번에 키워드를 생성할 종목 수
+
+
+class StockKeywords(TypedDict):
+    """LLM 구조화 출력 스키마 (종목별 키워드)"""
+    ticker: str
+    keywords: List[str]
+
+
+# JSON 모드 + 스키마로 응답을 강제 (```json 펜스 제거·형식 오류 폴백 불필요)
+GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': list[StockKeywords],
+    'temperature': 0.2,  # 같은 종목이면 같은 키워드 (캐시 일관성)
+}
+
+
+def _format_market_cap(market_cap) -> str:
+    """시가총액 표시 (조원/억원)"""
+    market_cap = market_cap or 0
+    if market_cap > 1e12:
+        return f"{market_cap / 1e12:.1f}조원"
+    if market_cap > 1e8:
+        return f"{market_cap / 1e8:.0f}억원"
+    return "N/A"
+
 
 class QueryExpander:
     """LLM 기반 검색 쿼리 확장기"""
@@ -25,7 +52,9 @@ class QueryExpander:
             raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다")
         
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-flash-latest")
+        self.model = genai.GenerativeModel(
+            "gemini-flash-latest", generation_config=GENERATION_CONFIG
+        )
     
     def expand_query(self, stock_info: Dict[str, Any]) -> List[str]:
         """종목 정보로 검색 키워드 생성
@@ -42,73 +71,80 @@ class QueryExpander:
         Returns:
             ['제닉', '제닉 화장품', '마스크팩', 'K-뷰티', '하이드로겔']
         """
-        name = stock_info.get('name', '')
-        sector = stock_info.get('sector', '')
-        market_cap = stock_info.get('market_cap', 0)
-        industry = stock_info.get('industry', '')
+        key = stock_info.get('ticker') or stock_info.get('name', '')
+        keywords = self.expand_queries_batch([stock_info]).get(key)
+        return keywords or self._fallback_keywords(stock_info)
+    
+    def expand_queries_batch(self, stock_infos: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """여러 종목의 검색 키워드를 한 번의 LLM 호출로 생성
         
-        # 시가총액 포맷팅
-        if market_cap > 1e12:
-            mc_str = f"{market_cap / 1e12:.1f}조원"
-        elif market_cap > 1e8:
-            mc_str = f"{market_cap / 1e8:.0f}억원"
-        else:
-            mc_str = "N/A"
+        Args:
+            stock_infos: expand_query 와 같은 형식의 종목 정보 리스트
+                (EXPAND_BATCH_SIZE 개 이하 권장 - 응답 길이 제한)
+        
+        Returns:
+            {종목코드: 키워드 리스트} - LLM 이 답한 종목만 포함.
+            호출 실패·응답 누락·형식 오류 종목은 빠지며, 폴백은 호출하는 쪽이 정한다
+            (캐시에 폴백 키워드가 LLM 결과처럼 저장되지 않도록)
+        """
+        keys = [info.get('ticker') or info.get('name', '') for info in stock_infos]
+        
+        entries = []
+        for idx, (key, info) in enumerate(zip(keys, stock_infos), 1):
+            sector = info.get('sector') or info.get('industry') or 'N/A'
+            entries.append(
+                f"{idx}. 종목코드: {key}, 종목명: {info.get('name', '')}, "
+                f"업종: {sector}, 시가총액: {_format_market_cap(info.get('market_cap'))}"
+            )
+        entries_text = "\n".join(entries)
         
         prompt = f"""당신은 한국 증시 뉴스 검색 전문가입니다.
 
-다음 종목의 관련 뉴스를 검색하기 위한 최적의 검색 키워드를 생성하세요.
+다음 종목들의 관련 뉴스를 검색하기 위한 최적의 검색 키워드를 생성하세요.
 
-종목 정보:
-- 종목명: {name}
-- 업종: {sector or industry or 'N/A'}
-- 시가총액: {mc_str}
+종목 목록:
+{entries_text}
 
 요구사항:
-1. 5-7개의 검색 키워드 생성
+1. 종목마다 5-7개의 검색 키워드 생성
 2. 첫 번째는 반드시 종목명
 3. 업종 특성을 반영한 키워드 포함
 4. 관련 제품/기술/트렌드 키워드 포함
 5. 한국어로 생성
 
-출력 형식 (JSON 배열만):
-["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"]
+출력 형식 (종목마다 ticker 에 종목코드, keywords 에 키워드 리스트):
+[{{"ticker": "종목코드1", "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"]}}, ...]
 
 예시:
-종목: 삼성전자, 업종: 반도체
-→ ["삼성전자", "삼성 반도체", "HBM", "파운드리", "반도체 투자"]
-
-종목: 제닉, 업종: 화장품
-→ ["제닉", "제닉 화장품", "마스크팩", "하이드로겔", "K-뷰티 수출"]
-
-이제 위 종목의 키워드를 JSON 배열로만 출력하세요:"""
+종목: 005930 삼성전자 (반도체), 123330 제닉 (화장품)
+→ [{{"ticker": "005930", "keywords": ["삼성전자", "삼성 반도체", "HBM", "파운드리", "반도체 투자"]}}, {{"ticker": "123330", "keywords": ["제닉", "제닉 화장품", "마스크팩", "하이드로겔", "K-뷰티 수출"]}}]"""
         
         try:
             response = self.model.generate_content(prompt)
-            text = response.text.strip()
-            
-            # JSON 파싱
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            keywords = json.loads(text)
+            parsed = {
+                item['ticker']: item['keywords']
+                for item in json.loads(response.text)
+            }
+        except Exception as e:
+            logger.error(f"[QueryExpander] {len(stock_infos)}개 종목 실패: {e}")
+            parsed = {}
+        
+        results = {}
+        for key, info in zip(keys, stock_infos):
+            name = info.get('name', '')
+            keywords = parsed.get(key)
             
-            if not isinstance(keywords, list):
-                logger.warning(f"[QueryExpander] 잘못된 형식: {text}")
-                return self._fallback_keywords(stock_info)
+            if not isinstance(keywords, list) or not keywords:
+                continue
             
             # 종목명이 첫 번째인지 확인
-            if keywords and keywords[0].lower() != name.lower():
+            if str(keywords[0]).lower() != name.lower():
                 keywords.insert(0, name)
             
             logger.info(f"[QueryExpander] {name}: {len(keywords)}개 키워드 생성")
-            return keywords[:7]  # 최대 7개
-            
-        except Exception as e:
-            logger.error(f"[QueryExpander] {name} 실패: {e}")
-            return self._fallback_keywords(stock_info)
+            results[key] = keywords[:7]  # 최대 7개
+        
+        return results
     
     def _fallback_keywords(self, stock_info: Dict[str, Any]) -> List[str]:
         """폴백: 기본 키워드 생성"""
@@ -119,3 +155,17 @@ class QueryExpander:
             keywords.append(stock_info['sector'])
         
         return keywords
+
+
+_query_expander = None
+_query_expander_lock = threading.Lock()
+
+
+def get_query_expander() -> QueryExpander:
+    """싱글톤 인스턴스 반환 (genai.configure·모델 생성 1회, SDK 클라이언트 재사용)"""
+    global _query_expander
+    if _query_expander is None:
+        with _query_expander_lock:
+            if _query_expander is None:
+                _query_expander = QueryExpander()
+    return _query_expander
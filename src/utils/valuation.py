@@ -6,6 +6,12 @@ TTM 기반 PER/PBR/EPS 계산
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
+from sqlalchemy import select
+
+# TTM 계산에 쓰는 raw_data 키 (합산: 손익 3개, 최신값: 자본총계)
+TTM_SUM_KEYS = ('revenue', 'net_income', 'operating_income')
+TTM_KEYS = TTM_SUM_KEYS + ('total_equity',)
+
 
 def calculate_ttm_metrics(session, stock_id: int, current_price: float, market_cap: float = None) -> Optional[Dict]:
     """TTM (Trailing 12 Months) 기반 밸류에이션 지표 계산
@@ -31,35 +37,26 @@ def calculate_ttm_metrics(session, stock_id: int, current_price: float, market_c
     from src.storage.models import FinancialStatement, Stock
     
     # 최근 4분기 재무제표 (OpenDartReader 우선)
-    statements = (
-        session.query(FinancialStatement)
-        .filter(FinancialStatement.stock_id == stock_id)
-        .filter(FinancialStatement.source == 'opendartreader')
+    # raw_data 전체 대신 필요한 JSON 키만 DB 에서 꺼내 조회 (JSONB ->> / json_extract)
+    rows = session.execute(
+        select(*(FinancialStatement.raw_data[key].as_float().label(key) for key in TTM_KEYS))
+        .where(FinancialStatement.stock_id == stock_id)
+        .where(FinancialStatement.source == 'opendartreader')
         .order_by(FinancialStatement.period_end.desc())
         .limit(4)
-        .all()
-    )
+    ).all()
     
-    if len(statements) < 4:
+    if len(rows) < 4:
         # 4분기 미만이면 계산 불가
         return None
     
-    # TTM 합산
-    ttm_revenue = 0
-    ttm_net_income = 0
-    ttm_operating_income = 0
-    latest_equity = None
-    
-    for stmt in statements:
-        if stmt.raw_data:
-            data = stmt.raw_data
-            ttm_revenue += data.get('revenue', 0)
-            ttm_net_income += data.get('net_income', 0)
-            ttm_operating_income += data.get('operating_income', 0)
-            
-            # 최신 자본총계
-            if latest_equity is None and data.get('total_equity'):
-                latest_equity = data['total_equity']
+    # TTM 합산 (값 없는 분기는 0)
+    ttm_revenue, ttm_net_income, ttm_operating_income = (
+        sum(getattr(row, key) or 0 for row in rows) for key in TTM_SUM_KEYS
+    )
+    
+    # 최신 자본총계
+    latest_equity = next((row.total_equity for row in rows if row.total_equity), None)
     
     # 시가총액 확보
     if not market_cap:
@@ -98,7 +95,7 @@ def calculate_ttm_metrics(session, stock_id: int, current_price: float, market_c
         'bps': bps,
         'pbr': pbr,
         'total_equity': latest_equity,
-        'quarters_used': len(statements),
+        'quarters_used': len(rows),
     }
     
     return result
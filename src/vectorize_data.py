@@ -5,8 +5,12 @@ DB의 뉴스와 재무제표를 ChromaDB로 벡터화
 """
 import sys
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy import select
 from src.storage.database import init_db
-from src.storage.models import NewsArticle, FinancialStatement
+from src.storage.models import NewsArticle, NewsContent, FinancialStatement, Stock
 from src.utils.helpers import load_config
 from src.rag import VectorStore
 
@@ -16,6 +20,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger("marketsense")
 
+# 재무제표 요약에 포함할 항목 (컬럼, 표시 이름)
+FINANCIAL_SUMMARY_FIELDS = (
+    ('revenue', '매출'),
+    ('operating_income', '영업이익'),
+    ('net_income', '당기순이익'),
+    ('total_assets', '총자산'),
+    ('total_liabilities', '총부채'),
+    ('total_equity', '자본총계'),
+)
+
+# 임베딩 대기 배치 수 상한 (DB 조회가 앞서 나가도 메모리에 쌓이는 배치 제한)
+EMBED_MAX_INFLIGHT = 2
+
+
+@contextmanager
+def _embedding_worker():
+    """임베딩·저장을 백그라운드 스레드에서 실행하는 submit(fn, batch) 제공
+    
+    메인 스레드가 다음 배치를 조회·변환하는 동안 이전 배치를 임베딩한다.
+    임베딩 모델은 로컬(SentenceTransformer)이라 이미 CPU 코어를 모두 쓰므로
+    작업자는 1개만 두고, 컬렉션 쓰기 순서도 그대로 유지한다.
+    블록을 벗어날 때 남은 배치를 모두 기다리며 작업 중 예외는 그대로 전파된다.
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def submit(fn, batch):
+            if len(pending) >= EMBED_MAX_INFLIGHT:
+                pending.popleft().result()
+            pending.append(executor.submit(fn, batch))
+        
+        yield submit
+        
+        while pending:
+            pending.popleft().result()
+
 
 def vectorize_news(db, vs: VectorStore, limit: int = None):
     """뉴스 벡터화
@@ -27,38 +66,49 @@ def vectorize_news(db, vs: VectorStore, limit: int = None):
     """
     logger.info("뉴스 벡터화 시작...")
     
-    with db.get_session() as session:
-        query = session.query(NewsArticle)
+    batch_size = 100
+    total = 0
+    
+    with db.get_session() as session, _embedding_worker() as embed:
+        # ORM 객체 대신 필요한 컬럼만, 서버 측 커서로 batch_size 씩 스트리밍
+        query = (
+            select(
+                NewsArticle.id,
+                NewsArticle.ticker,
+                NewsArticle.title,
+                NewsContent.content,
+                NewsArticle.summary,
+                NewsArticle.source,
+                NewsArticle.published_at,
+                NewsArticle.url,
+            )
+            .outerjoin(NewsContent, NewsContent.article_id == NewsArticle.id)
+            .execution_options(yield_per=batch_size)
+        )
         
         if limit:
             query = query.limit(limit)
         
-        articles = query.all()
-        
-        logger.info(f"뉴스 {len(articles)}개 로드 완료")
-        
-        # 배치 처리
-        batch_size = 100
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i+batch_size]
-            
+        for batch in session.execute(query).partitions():
             # Dict 변환
-            article_dicts = []
-            for article in batch:
-                article_dicts.append({
-                    'id': str(article.id),
-                    'ticker': article.ticker or '',
-                    'title': article.title or '',
-                    'content': article.content or article.summary or '',
-                    'source': article.source or '',
-                    'published_at': article.published_at,
-                    'url': article.url or ''
-                })
+            article_dicts = [
+                {
+                    'id': str(row.id),
+                    'ticker': row.ticker or '',
+                    'title': row.title or '',
+                    'content': row.content or row.summary or '',
+                    'source': row.source or '',
+                    'published_at': row.published_at,
+                    'url': row.url or ''
+                }
+                for row in batch
+            ]
             
-            # 벡터화
-            vs.add_news(article_dicts)
+            # 벡터화 (백그라운드)
+            embed(vs.add_news, article_dicts)
             
-            logger.info(f"진행: {min(i+batch_size, len(articles))}/{len(articles)}")
+            total += len(batch)
+            logger.info(f"진행: {total}개")
     
     logger.info("✅ 뉴스 벡터화 완료!")
 
@@ -73,59 +123,56 @@ def vectorize_financials(db, vs: VectorStore, limit: int = None):
     """
     logger.info("재무제표 벡터화 시작...")
     
-    with db.get_session() as session:
-        query = session.query(FinancialStatement).filter(
-            FinancialStatement.statement_type == 'income'  # 손익계산서만
+    batch_size = 50
+    total = 0
+    
+    with db.get_session() as session, _embedding_worker() as embed:
+        # 손익계산서만, 종목명까지 조인한 컬럼 행을 서버 측 커서로 batch_size 씩 스트리밍
+        query = (
+            select(
+                FinancialStatement.id,
+                FinancialStatement.period_end,
+                FinancialStatement.statement_type,
+                Stock.ticker,
+                Stock.name,
+                *(getattr(FinancialStatement, field) for field, _ in FINANCIAL_SUMMARY_FIELDS),
+            )
+            .outerjoin(Stock, Stock.id == FinancialStatement.stock_id)
+            .where(FinancialStatement.statement_type == 'income')
+            .execution_options(yield_per=batch_size)
         )
         
         if limit:
             query = query.limit(limit)
         
-        statements = query.all()
-        
-        logger.info(f"재무제표 {len(statements)}개 로드 완료")
-        
-        # 배치 처리
-        batch_size = 50
-        for i in range(0, len(statements), batch_size):
-            batch = statements[i:i+batch_size]
-            
+        for batch in session.execute(query).partitions():
             # Dict 변환 + 요약 생성
             stmt_dicts = []
-            for stmt in batch:
-                # 종목 조회
-                stock = stmt.stock
-                ticker = stock.ticker if stock else ''
-                name = stock.name if stock else ''
+            for row in batch:
+                ticker = row.ticker or ''
+                name = row.name or ''
                 
                 # 요약 텍스트 생성
-                summary = f"{name} ({ticker}) {stmt.period_end} 재무제표\n"
-                
-                if stmt.revenue:
-                    summary += f"매출: {stmt.revenue:,.0f}원\n"
-                if stmt.operating_income:
-                    summary += f"영업이익: {stmt.operating_income:,.0f}원\n"
-                if stmt.net_income:
-                    summary += f"당기순이익: {stmt.net_income:,.0f}원\n"
-                if stmt.total_assets:
-                    summary += f"총자산: {stmt.total_assets:,.0f}원\n"
-                if stmt.total_liabilities:
-                    summary += f"총부채: {stmt.total_liabilities:,.0f}원\n"
-                if stmt.total_equity:
-                    summary += f"자본총계: {stmt.total_equity:,.0f}원\n"
+                lines = [f"{name} ({ticker}) {row.period_end} 재무제표"]
+                for field, label in FINANCIAL_SUMMARY_FIELDS:
+                    value = row._mapping[field]
+                    if value:
+                        lines.append(f"{label}: {value:,.0f}원")
+                summary = "\n".join(lines) + "\n"
                 
                 stmt_dicts.append({
-                    'id': str(stmt.id),
+                    'id': str(row.id),
                     'ticker': ticker,
-                    'period': str(stmt.period_end),
-                    'statement_type': stmt.statement_type,
+                    'period': str(row.period_end),
+                    'statement_type': row.statement_type,
                     'summary': summary
                 })
             
-            # 벡터화
-            vs.add_financials(stmt_dicts)
+            # 벡터화 (백그라운드)
+            embed(vs.add_financials, stmt_dicts)
             
-            logger.info(f"진행: {min(i+batch_size, len(statements))}/{len(statements)}")
+            total += len(batch)
+            logger.info(f"진행: {total}개")
     
     logger.info("✅ 재무제표 벡터화 완료!")
 
@@ -0,0 +1,68 @@
+"""pytest 공통 설정 - 프로젝트 루트 경로와 DB 픽스처"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.storage.database import Database
+
+TEST_PRAGMAS = (
+    "synchronous=OFF",
+    "journal_mode=MEMORY",
+    "temp_store=MEMORY",
+    "locking_mode=EXCLUSIVE",
+)
+
+
+@pytest.fixture(scope="session")
+def db():
+    """세션 전체에서 공유하는 인메모리 DB (스키마는 한 번만 생성)
+
+    공유 캐시 URI + StaticPool: 모든 세션이 같은 연결(같은 DB)을 사용한다.
+    """
+    db = Database(
+        "sqlite+pysqlite:///file::memory:?cache=shared&uri=true",
+        connect_args={"uri": True},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(db.engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        # pysqlite 는 BEGIN/SAVEPOINT 를 자체 관리하므로 SQLAlchemy 가 직접 내보내도록 설정
+        dbapi_connection.isolation_level = None
+        # 테스트 DB 는 버려지므로 동기화·저널 비용 제거
+        cursor = dbapi_connection.cursor()
+        for pragma in TEST_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    @event.listens_for(db.engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    db.create_tables()
+    return db
+
+
+@pytest.fixture
+def db_session(db):
+    """테스트마다 외부 트랜잭션에 묶인 세션 - 종료 시 롤백으로 원상 복구"""
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    # 테스트는 명시적으로 flush 하고, 커밋 후에도 속성 재조회(SELECT) 없이 읽는다
+    session = Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
@@ -0,0 +1,108 @@
+"""재무 지표 4분기 가로 표시·증감률 골든 테스트
+
+tests/golden/financial_metrics.json 은 행렬 계산으로 바꾸기 전 구현(분기·지표별 반복문)의
+출력이다. 같은 입력에서 보고서 텍스트와 증감률·추세 결과가 그대로 유지되는지 확인한다.
+"""
+import json
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.financial_metrics import (
+    calculate_growth_rates,
+    format_quarterly_metrics_horizontal,
+)
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden" / "financial_metrics.json"
+GOLDEN = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+
+# 최신순 분기 말일
+PERIODS = (
+    date(2024, 12, 31), date(2024, 9, 30), date(2024, 6, 30),
+    date(2024, 3, 31), date(2023, 12, 31),
+)
+
+
+def _quarter(i: int, **overrides) -> dict:
+    """i 번째(최신순) 분기 raw_data - 분기마다 값이 달라지도록 구성"""
+    rd = {
+        'revenue': 700_000_000_000 - i * 25_000_000_000,
+        'operating_income': 90_000_000_000 + (i % 2) * 30_000_000_000 - i * 5_000_000_000,
+        'net_income': 60_000_000_000 - i * 7_500_000_000,
+        'operating_margin': 12.9 - i * 0.7,
+        'net_margin': 8.6 - i * 0.45,
+        'total_assets': 4_000_000_000_000 - i * 50_000_000_000,
+        'total_liabilities': 1_500_000_000_000 + i * 10_000_000_000,
+        'total_equity': 2_500_000_000_000 - i * 60_000_000_000,
+        'debt_ratio': 60.0 + i * 2.35,
+        'operating_cash_flow': 120_000_000_000 - i * 33_000_000_000,
+        'investing_cash_flow': -80_000_000_000 + i * 12_000_000_000,
+        'financing_cash_flow': -15_000_000_000 + i * 9_000_000_000,
+        'roe': 9.6 - i * 1.05,
+        'roa': 4.1 - i * 0.55,
+    }
+    rd.update(overrides)
+    return rd
+
+
+def _statements(raw_datas) -> list:
+    return [
+        SimpleNamespace(period_end=period, raw_data=rd)
+        for period, rd in zip(PERIODS, raw_datas)
+    ]
+
+
+CASES = {
+    # 5분기 전부 있는 경우 (QoQ·YoY·추세 모두 표시)
+    'full': lambda: _statements(_quarter(i) for i in range(5)),
+    # None/0 값 - 0 은 N/A 로 표시되고 증감률에서 빠지며, 비율 차이는 0 도 계산
+    'none_and_zero': lambda: _statements([
+        _quarter(0, revenue=0, net_margin=None, roe=0.0, financing_cash_flow=None),
+        _quarter(1, operating_income=None, investing_cash_flow=0, roe=None),
+        _quarter(2, net_income=0, operating_margin=None),
+        _quarter(3, operating_cash_flow=None, debt_ratio=0.0),
+        _quarter(4, revenue=None, operating_income=0),
+    ]),
+    # 중간 분기 데이터 없음 (raw_data None / 일부 지표만 없음)
+    'missing_middle_quarter': lambda: _statements([
+        _quarter(0),
+        _quarter(1, revenue=None, roe=None, operating_margin=None),
+        None,
+        _quarter(3),
+        _quarter(4),
+    ]),
+    # 최신 분기 지표 누락 + 값이 같은 분기 (횡보 판단)
+    'missing_latest_and_flat': lambda: _statements([
+        _quarter(0, revenue=None, net_income=None, operating_cash_flow=None),
+        _quarter(1, operating_income=100_000_000_000),
+        _quarter(2, operating_income=100_000_000_000, roe=7.5),
+        _quarter(3, roe=7.5),
+        _quarter(4),
+    ]),
+    # 5분기 미만 - YoY 없음
+    'four_quarters': lambda: _statements(_quarter(i) for i in range(4)),
+    'three_quarters': lambda: _statements(_quarter(i) for i in range(3)),
+    'two_quarters': lambda: _statements(_quarter(i) for i in range(2)),
+}
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_horizontal_report_matches_golden(case):
+    assert format_quarterly_metrics_horizontal(CASES[case]()) == GOLDEN[case]['report']
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_growth_rates_match_golden(case):
+    assert calculate_growth_rates(CASES[case]()) == GOLDEN[case]['growth']
+
+
+def test_empty_report_is_omitted():
+    """지표가 전부 비어 있으면 (이전 구현과 달리) 빈 섹션 제목만 있는 보고서를 내지 않는다"""
+    statements = _statements([None, {}, {'revenue': 0}, None, None])
+    assert format_quarterly_metrics_horizontal(statements) == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
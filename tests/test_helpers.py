@@ -0,0 +1,58 @@
+"""유틸리티 함수 테스트"""
+import os
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import helpers
+from src.utils.helpers import is_process_running
+
+
+class TestIsProcessRunning:
+    @pytest.fixture
+    def sleeper(self):
+        """cmdline 이 'sleep 30' 인 자식 프로세스"""
+        proc = subprocess.Popen(["sleep", "30"])
+        yield proc
+        proc.kill()
+        proc.wait()
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc 없음")
+    def test_proc_scan(self, sleeper):
+        assert is_process_running("sleep 30")
+        assert not is_process_running("no-such-process-7f3a")
+
+    @pytest.mark.parametrize("stdout, expected", [("12345\n", True), ("", False)])
+    def test_pgrep_without_proc(self, monkeypatch, stdout, expected):
+        """/proc 이 없는 macOS 에서는 pgrep -f 결과 사용"""
+        def no_proc(path):
+            raise FileNotFoundError(path)
+
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return SimpleNamespace(returncode=0 if stdout else 1, stdout=stdout)
+
+        monkeypatch.setattr(helpers.os, "listdir", no_proc)
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        assert is_process_running("realtime_monitor") is expected
+        assert calls == [["pgrep", "-f", "realtime_monitor"]]
+
+    def test_pgrep_missing(self, monkeypatch):
+        def no_proc(path):
+            raise FileNotFoundError(path)
+
+        def no_pgrep(cmd, **kwargs):
+            raise FileNotFoundError(cmd[0])
+
+        monkeypatch.setattr(helpers.os, "listdir", no_proc)
+        monkeypatch.setattr(subprocess, "run", no_pgrep)
+
+        assert is_process_running("realtime_monitor") is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+"""뉴스 수집기 검색 키워드 일괄 생성 테스트 (LLM 호출 없이)"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.generativeai")
+news_collector = pytest.importorskip("src.collectors.news_collector")
+
+from src.storage.models import Stock
+from src.utils import query_expander
+
+
+class _StubModel:
+    def __init__(self, text=None, error=None):
+        self.text, self.error = text, error
+
+    def generate_content(self, prompt):
+        if self.error:
+            raise self.error
+        return SimpleNamespace(text=self.text)
+
+
+@pytest.fixture
+def stocks():
+    return [
+        Stock(ticker="005930", name="삼성전자", sector="반도체"),
+        Stock(ticker="123330", name="제닉", sector="화장품"),
+    ]
+
+
+def _prefetch(monkeypatch, stocks, model):
+    expander = object.__new__(query_expander.QueryExpander)
+    expander.model = model
+    monkeypatch.setattr(query_expander, "_query_expander", expander)
+    collector = object.__new__(news_collector.NewsCollector)
+    collector._prefetch_search_keywords(stocks)
+
+
+def test_llm_error_is_not_cached(monkeypatch, stocks):
+    _prefetch(monkeypatch, stocks, _StubModel(error=RuntimeError("quota exceeded")))
+
+    # 폴백 키워드가 LLM 결과처럼 캐시되면 안 됨 → _expand_query 가 종목별로 다시 시도
+    for stock in stocks:
+        assert "search_keywords" not in (stock.raw_data or {})
+
+
+def test_only_answered_tickers_are_cached(monkeypatch, stocks):
+    answer = [{"ticker": "005930", "keywords": ["삼성전자", "HBM", "파운드리"]}]
+    _prefetch(monkeypatch, stocks, _StubModel(text=json.dumps(answer, ensure_ascii=False)))
+
+    samsung, genic = stocks
+    assert samsung.raw_data["search_keywords"] == ["삼성전자", "HBM", "파운드리"]
+    assert "search_keywords" not in (genic.raw_data or {})
+
+
+def test_single_stock_falls_back(monkeypatch):
+    expander = object.__new__(query_expander.QueryExpander)
+    expander.model = _StubModel(error=ValueError("malformed JSON"))
+
+    keywords = expander.expand_query({"ticker": "123330", "name": "제닉", "sector": "화장품"})
+
+    assert keywords == ["제닉", "제닉 화장품", "화장품"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
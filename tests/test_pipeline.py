@@ -1,85 +1,285 @@
 """파이프라인 기본 테스트"""
+from pathlib import Path
+
 import pytest
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import bindparam, insert, inspect, select
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import selectinload
 
-from src.storage.database import Database
-from src.storage.models import Base, Stock, NewsArticle, PriceData, MacroIndicator
+from src.storage.models import (
+    Base, Stock, NewsArticle, PriceData, MacroIndicator,
+    SECFiling, SECFilingBlob,
+)
 from src.utils.helpers import load_config
 
+_EXPECTED_TABLES = frozenset({
+    "stocks", "news_articles", "financial_statements", "sec_filings",
+    "earnings_calls", "price_data", "technical_indicators", "macro_reports",
+    "macro_indicators", "pipeline_runs", "news_contents", "sec_filing_blobs",
+    "earnings_call_blobs", "macro_report_blobs", "sector_metrics",
+})
+_DECLARED_TABLES = frozenset(Base.metadata.tables)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "config.yaml"
+HAS_CONFIG = CONFIG_PATH.exists()  # 수집 시 한 번만 확인
+
+# 바인드 파라미터로 재사용하는 조회문 (컴파일 결과는 엔진 캐시에서 재사용)
+_STOCK_BY_TICKER = select(Stock).where(Stock.ticker == bindparam("ticker"))
+
+
+def _check_stock(session):
+    found = session.execute(_STOCK_BY_TICKER, {"ticker": "AAPL"}).scalar_one()
+    assert found.name == "Apple Inc."
+    assert found.sector == "Technology"
+
+
+def _check_news(session):
+    # 필요한 컬럼만 조인 조회 (ORM 객체 생성·지연 로드 없음)
+    title, stock_ticker = session.execute(
+        select(NewsArticle.title, Stock.ticker).join(NewsArticle.stock)
+    ).one()
+    assert title == "Test News"
+    assert stock_ticker == "MSFT"
+
 
 class TestDatabase:
     """데이터베이스 테스트"""
 
-    def setup_method(self):
-        self.db = Database("sqlite:///:memory:")
-        self.db.create_tables()
-
-    def test_create_tables(self):
-        tables = Base.metadata.tables
-        assert "stocks" in tables
-        assert "news_articles" in tables
-        assert "financial_statements" in tables
-        assert "sec_filings" in tables
-        assert "earnings_calls" in tables
-        assert "price_data" in tables
-        assert "technical_indicators" in tables
-        assert "macro_reports" in tables
-        assert "macro_indicators" in tables
-        assert "pipeline_runs" in tables
-
-    def test_add_stock(self):
-        with self.db.get_session() as session:
-            stock = Stock(ticker="AAPL", name="Apple Inc.", sector="Technology")
-            session.add(stock)
-
-        with self.db.get_session() as session:
-            found = session.query(Stock).filter_by(ticker="AAPL").first()
-            assert found is not None
-            assert found.name == "Apple Inc."
-
-    def test_add_news(self):
-        with self.db.get_session() as session:
-            stock = Stock(ticker="MSFT", name="Microsoft")
-            session.add(stock)
-            session.flush()
+    def test_create_tables(self, db):
+        assert _EXPECTED_TABLES <= _DECLARED_TABLES, _EXPECTED_TABLES - _DECLARED_TABLES
+        missing = _EXPECTED_TABLES - set(inspect(db.engine).get_table_names())
+        assert not missing, missing
 
-            news = NewsArticle(
-                stock_id=stock.id,
+    @pytest.mark.parametrize("check", [_check_stock, _check_news], ids=["stock", "news"])
+    def test_add_stock_and_news(self, db_session, check):
+        # 종목·뉴스를 한 트랜잭션에서 함께 넣고 (flush 1회) 항목별로 확인
+        msft = Stock(ticker="MSFT", name="Microsoft")
+        db_session.add_all([
+            Stock(ticker="AAPL", name="Apple Inc.", sector="Technology"),
+            msft,
+            NewsArticle(
+                stock=msft,
                 ticker="MSFT",
                 title="Test News",
                 url="https://example.com/news/1",
                 source="test",
+            ),
+        ])
+        db_session.flush()
+
+        check(db_session)
+
+    def test_filing_blob_side_table(self, db_session):
+        from datetime import date
+
+        stock = Stock(ticker="NVDA", name="NVIDIA")
+        db_session.add(stock)
+        db_session.flush()
+
+        filing = SECFiling(
+            stock_id=stock.id,
+            filing_type="10-K",
+            accession_number="0001",
+            filing_date=date(2024, 1, 31),
+        )
+        filing.blob = SECFilingBlob(raw_text="full text")
+        db_session.add(filing)
+        db_session.flush()
+        db_session.expunge_all()
+
+        filing = db_session.query(SECFiling).first()
+        with pytest.raises(InvalidRequestError):
+            filing.blob  # lazy="raise": 본문은 명시적 로드만 허용
+        db_session.expunge_all()
+
+        filing = db_session.query(SECFiling).options(
+            selectinload(SECFiling.blob)
+        ).first()
+        assert filing.blob.raw_text == "full text"
+
+    def test_unique_constraints(self, db_session):
+        db_session.add(Stock(ticker="GOOGL", name="Alphabet"))
+        db_session.flush()
+
+        # SAVEPOINT 만 롤백되고 바깥 세션은 계속 사용 가능
+        with pytest.raises(IntegrityError):
+            with db_session.begin_nested():
+                db_session.add(Stock(ticker="GOOGL", name="Alphabet Dup"))
+                db_session.flush()
+
+        stock = db_session.execute(_STOCK_BY_TICKER, {"ticker": "GOOGL"}).scalar_one()
+        assert stock.name == "Alphabet"
+
+
+class TestTimestamps:
+    def test_collected_at_without_server_default(self):
+        """DB 기본값이 없는 기존 테이블에서도 INSERT 시 수집 시각이 채워짐"""
+        from sqlalchemy import MetaData, create_engine
+        from sqlalchemy.orm import Session
+
+        # server_default 도입 전 스키마 재현
+        engine = create_engine("sqlite://")
+        legacy = MetaData()
+        for table in (Stock.__table__, NewsArticle.__table__):
+            for column in table.to_metadata(legacy).columns:
+                column.server_default = None
+        legacy.create_all(engine)
+
+        with Session(engine) as session:
+            session.add(NewsArticle(title="t", url="https://example.com/legacy"))
+            session.flush()
+            collected_at = session.scalar(select(NewsArticle.collected_at))
+
+        assert collected_at is not None
+
+
+class TestMigrations:
+    def test_backfill_news_contents(self):
+        """옛 news_articles.content 가 news_contents 로 복사되고 재실행해도 중복 없음"""
+        from src.storage.database import Database
+        from src.storage.migrations import backfill_side_tables
+        from src.storage.models import NewsContent
+
+        db = Database("sqlite://")
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE news_articles ADD COLUMN content TEXT")
+            conn.exec_driver_sql(
+                "INSERT INTO news_articles (id, title, url, content) VALUES "
+                "(1, 'a', 'https://example.com/a', 'body a'), "
+                "(2, 'b', 'https://example.com/b', NULL)"
+            )
+
+        backfill_side_tables(db.engine)
+        backfill_side_tables(db.engine)
+
+        with db.get_session() as session:
+            rows = session.execute(
+                select(NewsContent.article_id, NewsContent.content)
+            ).all()
+        assert rows == [(1, "body a")]
+
+    def test_backfill_filing_blobs(self):
+        """옛 sec_filings 본문 컬럼 중 있는 것만 sec_filing_blobs 로 복사"""
+        from src.storage.database import Database
+        from src.storage.migrations import backfill_side_tables
+
+        db = Database("sqlite://")
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE sec_filings ADD COLUMN raw_text TEXT")
+            conn.exec_driver_sql("ALTER TABLE sec_filings ADD COLUMN md_and_a TEXT")
+            conn.exec_driver_sql(
+                "INSERT INTO sec_filings (id, stock_id, filing_type, accession_number, "
+                "filing_date, md_and_a) VALUES (1, 1, '10-K', '0001', '2024-01-31', 'mda')"
             )
-            session.add(news)
 
-        with self.db.get_session() as session:
-            found = session.query(NewsArticle).first()
-            assert found.title == "Test News"
+        backfill_side_tables(db.engine)
+
+        with db.get_session() as session:
+            blob = session.get(SECFilingBlob, 1)
+            assert (blob.raw_text, blob.md_and_a) == (None, "mda")
+
+
+class TestClassifySector:
+    def test_keyword_priority(self):
+        from src.update_sectors import classify_sector
 
-    def test_unique_constraints(self):
-        with self.db.get_session() as session:
-            stock = Stock(ticker="GOOGL", name="Alphabet")
-            session.add(stock)
+        # '삼성전자'는 '전자' 키워드도 포함하지만 먼저 정의된 반도체로 분류
+        assert classify_sector("삼성전자") == ("반도체", "반도체")
+        assert classify_sector("LG전자") == ("전자", "전자")
+        assert classify_sector("셀트리온") == ("바이오", "바이오")
+        assert classify_sector("알수없음") == ("기타", "기타")
 
-        with pytest.raises(Exception):
-            with self.db.get_session() as session:
-                dup = Stock(ticker="GOOGL", name="Alphabet Dup")
-                session.add(dup)
+
+class TestPeerMetrics:
+    def test_latest_rows_and_outliers(self, db_session):
+        from datetime import date
+        from src.storage.models import FinancialStatement
+        from src.utils.peer_analysis import calculate_peer_metrics
+
+        # 픽스처 데이터는 ORM bulk INSERT 로 한 번에 (단위 작업 추적 생략)
+        a, b = db_session.scalars(insert(Stock).returning(Stock, sort_by_parameter_order=True), [
+            {"ticker": "000001", "name": "A", "sector": "반도체", "market_cap": 1e12},
+            {"ticker": "000002", "name": "B", "sector": "반도체", "market_cap": 2e12},
+        ]).all()
+        statements, prices = [], []
+        for stock, eps, close in ((a, 1000, 10000), (b, 10, 50000)):
+            # 오래된 재무제표는 무시되고 최신 분기만 사용
+            statements.append(dict(
+                stock_id=stock.id, statement_type="income", period_type="quarterly",
+                period_end=date(2023, 12, 31), raw_data={}, eps=1,
+            ))
+            statements.append(dict(
+                stock_id=stock.id, statement_type="income", period_type="quarterly",
+                period_end=date(2024, 3, 31), raw_data={}, eps=eps,
+                net_income=100, total_equity=1000, total_liabilities=500,
+            ))
+            prices.append(dict(stock_id=stock.id, date=date(2024, 4, 1), close=close))
+        db_session.execute(insert(FinancialStatement), statements)
+        db_session.execute(insert(PriceData), prices)
+
+        metrics = calculate_peer_metrics(db_session, [a, b])
+
+        assert metrics.count == 2
+        assert metrics.avg_pe == pytest.approx(10)  # B (PER 5000) 는 이상치로 제외
+        assert metrics.avg_debt_ratio == pytest.approx(50)
+        assert metrics.avg_roe == pytest.approx(10)
+
+    def test_sector_table_matches_live(self, db_session):
+        from dataclasses import asdict
+        from datetime import date
+        from src.storage.models import FinancialStatement
+        from src.utils.peer_analysis import (
+            calculate_peer_metrics, get_peer_stocks, get_sector_peers, refresh_sector_metrics,
+        )
+
+        stocks = db_session.scalars(insert(Stock).returning(Stock, sort_by_parameter_order=True), [
+            {"ticker": f"10000{i}", "name": f"S{i}", "sector": "화학", "market_cap": (i + 1) * 1e12}
+            for i in range(3)
+        ]).all()
+        db_session.execute(insert(FinancialStatement), [
+            dict(stock_id=s.id, statement_type="income", period_type="quarterly",
+                 period_end=date(2024, 3, 31), raw_data={}, eps=100 * (i + 1),
+                 net_income=100 * (i + 1), total_equity=1000, total_liabilities=300 * (i + 1))
+            for i, s in enumerate(stocks)
+        ])
+        db_session.execute(insert(PriceData), [
+            dict(stock_id=s.id, date=date(2024, 4, 1), close=1000) for s in stocks
+        ])
+        refresh_sector_metrics(db_session)
+
+        # 시총 상위 그룹 안의 종목도 자기 자신은 평균에서 빠져야 실시간 계산과 같다
+        target = stocks[1]
+        live_peers = get_peer_stocks(db_session, target.ticker)
+        live = calculate_peer_metrics(db_session, live_peers)
+        peers, stored = get_sector_peers(db_session, "화학", target.ticker)
+
+        assert [p["ticker"] for p in peers] == [p.ticker for p in live_peers]
+        assert target.ticker not in [p["ticker"] for p in peers]
+        assert asdict(stored) == pytest.approx(asdict(live))
+
+
+@pytest.fixture(scope="session")
+def app_config():
+    """config/config.yaml - 워커(프로세스)당 한 번만 파싱"""
+    return load_config(str(CONFIG_PATH))
 
 
 class TestConfig:
-    def test_load_config(self):
-        # config 파일이 있을 때만 테스트
-        if os.path.exists("config/config.yaml"):
-            config = load_config()
-            assert "database" in config
-            assert "news" in config
-            assert "fundamentals" in config
-            assert "dynamics" in config
-            assert "macro" in config
+    @pytest.mark.skipif(not HAS_CONFIG, reason="config/config.yaml 없음")
+    def test_load_config(self, app_config):
+        config = app_config
+        assert "database" in config
+        assert "news" in config
+        assert "fundamentals" in config
+        assert "dynamics" in config
+        assert "macro" in config
+
+        # 두 번째 호출은 캐시 적중 - 같은 내용의 독립된 복사본
+        again = load_config(str(CONFIG_PATH))
+        assert again == config and again is not config
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+"""텔레그램 봇 명령 파싱 테스트"""
+import pytest
+
+from src.telegram_bot import TelegramBot
+
+
+class TestParseBacktestArgs:
+    @pytest.mark.parametrize("args, expected", [
+        ("삼성전자", ("삼성전자", 1)),
+        ("삼성전자 2년", ("삼성전자", 2)),
+        ("삼성전자 3", ("삼성전자", 3)),
+        ("삼성전자\t2년", ("삼성전자", 2)),
+        ("  삼성전자 \n 5년  ", ("삼성전자", 5)),
+        ("삼성전자 2년 추가인자", ("삼성전자", 2)),
+        ("삼성전자 이년", ("삼성전자", 1)),
+        ("005930 10년", ("005930", 10)),
+    ])
+    def test_parse(self, args, expected):
+        assert TelegramBot._parse_backtest_args(args) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
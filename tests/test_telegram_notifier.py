@@ -0,0 +1,43 @@
+"""Telegram 알림 전송 테스트 (네트워크 없이)"""
+import pytest
+import requests
+
+from src.notifications import telegram_notifier
+from src.notifications.telegram_notifier import TelegramNotifier, to_telegram_html
+
+
+class TestToTelegramHtml:
+    @pytest.mark.parametrize("message, expected", [
+        ("**종목**: 삼성전자", "<b>종목</b>: 삼성전자"),
+        ("_※ 참고용_", "<i>※ 참고용</i>"),
+        ("*매수 신호 없음*", "<i>매수 신호 없음</i>"),
+        ("예: `/시세 005930`", "예: <code>/시세 005930</code>"),
+        # LLM 응답의 특수문자·짝 없는 기호는 문자 그대로
+        ("P/E < 10 & ROE > 5%", "P/E &lt; 10 &amp; ROE &gt; 5%"),
+        ("snake_case_name 2*3*4 **미완성", "snake_case_name 2*3*4 **미완성"),
+        # 태그가 엇갈리는 변환은 하지 않음
+        ("**a _b** c_", "<b>a _b</b> c_"),
+    ])
+    def test_convert(self, message, expected):
+        assert to_telegram_html(message) == expected
+
+
+class _TimeoutSession:
+    def post(self, *args, **kwargs):
+        raise requests.ReadTimeout("read timed out")
+
+
+def test_read_timeout_is_not_resent_via_cli(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "token")
+    notifier = TelegramNotifier(target="123")
+    notifier._session = _TimeoutSession()
+
+    def fail_cli(*args, **kwargs):
+        raise AssertionError("CLI 재전송")
+
+    monkeypatch.setattr(telegram_notifier.subprocess, "run", fail_cli)
+    assert notifier.send_to_user("123", "**테스트**") is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])